@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration for the Bidco Retail Analysis API
+========================================================
+Multi-process deployment with uvicorn workers. Run from the project root:
+
+    gunicorn -c gunicorn_conf.py api.main:app
+"""
+
+import os
+
+# Make `api.main` (and its top-level imports) resolvable from src/
+pythonpath = "src"
+
+bind = os.environ.get("API_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("API_WORKERS", (os.cpu_count() or 1) * 2))
+
+# Each worker imports the app and loads the data itself: Polars starts
+# its thread pool on the first read, and forking a process after that
+# can deadlock the pool in the children. The Parquet cache keeps these
+# per-worker loads cheap, and its memory-mapped pages are shared.
+preload_app = False
@@ -20,19 +20,23 @@ setup(
     packages=find_packages(where="src"),
     python_requires=">=3.11",
     install_requires=[
-        "polars>=0.20.0",
+        "polars>=1.25.0",
         "fastexcel>=0.7.0",
         "pydantic>=2.0.0",
         "plotly>=5.0.0",
         "duckdb>=0.9.0",
         "fastapi>=0.100.0",
-        "uvicorn>=0.23.0",
+        "orjson>=3.10.0",
+        "uvicorn[standard]>=0.23.0",
     ],
     extras_require={
         "dev": [
             "pytest>=7.0.0",
             "ruff>=0.1.0",
             "ipython>=8.0.0",
+        ],
+        "server": [
+            "gunicorn>=21.2.0",
         ]
     },
     entry_points={
@@ -2,15 +2,19 @@
 Analytics package for Bidco Retail Analysis
 """
 
+from .prepared import PreparedFrame
 from .promotions import PromoDetector, analyze_bidco_promos
 from .pricing import PriceIndexCalculator, analyze_bidco_pricing
 from .aggregations import KPIAggregator, generate_bidco_summary
+from .combined import analyze_bidco
 
 __all__ = [
+    "PreparedFrame",
     "PromoDetector",
     "analyze_bidco_promos",
     "PriceIndexCalculator",
     "analyze_bidco_pricing",
     "KPIAggregator",
     "generate_bidco_summary",
+    "analyze_bidco",
 ]
\ No newline at end of file
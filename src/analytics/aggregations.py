@@ -12,17 +12,20 @@ if __name__ == "__main__":
     sys.path.insert(0, str(project_root / "src"))
 
 import polars as pl
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from datetime import date
 
+from config import ANALYSIS_CONFIG
 from utils import (
-    calculate_realized_price,
-    flag_bidco_products,
-    filter_valid_transactions,
+    LRUCache,
+    scan_source,
     format_currency,
     format_percentage,
-    format_number
+    format_number,
+    supplier_names,
+    resolve_supplier
 )
+from analytics.prepared import PreparedFrame, prepare_plan
 
 
 class KPIAggregator:
@@ -30,87 +33,261 @@ class KPIAggregator:
     Aggregates transaction data into business KPIs.
     """
     
-    def __init__(self, df: pl.DataFrame):
+    def __init__(self, df: Union[pl.DataFrame, pl.LazyFrame, PreparedFrame]):
         """
-        Initialize with transaction data.
+        Initialize with transaction data (eager, lazy or already prepared).
         """
         self.df = df
+        self._supplier_cache = LRUCache(ANALYSIS_CONFIG.supplier_cache_size)
         self._prepare_data()
     
+    @classmethod
+    def from_source(cls, path: Union[str, Path]) -> "KPIAggregator":
+        """Build an aggregator that streams reports from a scanned file"""
+        return cls(scan_source(path))
+    
     def _prepare_data(self):
         """Prepare data with necessary derived fields"""
-        self.df = calculate_realized_price(self.df)
-        self.df = flag_bidco_products(self.df)
-        self.df = filter_valid_transactions(self.df, allow_negatives=False, allow_zeros=False)
+        if isinstance(self.df, pl.LazyFrame):
+            # Keep preparation in the plan; every report streams from the source
+            self.lf = prepare_plan(self.df)
+            self.df = None
+            self._engine = "streaming"
+            self._supplier_names = None
+            return
+        
+        if not isinstance(self.df, PreparedFrame):
+            self.df = PreparedFrame.of(self.df)
+        self.df = self.df.df
+        self.lf = self.df.lazy()
+        self._engine = "auto"
+        self._supplier_names = supplier_names(self.df)
     
-    def get_market_overview(self) -> Dict:
-        """Get high-level market metrics"""
+    def _collect(self, plan: pl.LazyFrame) -> pl.DataFrame:
+        """Collect a report plan with the engine suited to the source"""
+        return plan.collect(engine=self._engine)
+    
+    @staticmethod
+    def _sum(col: str, where: Optional[pl.Expr] = None) -> pl.Expr:
+        """Sum a Float32 measure with a Float64 accumulator"""
+        expr = pl.col(col).cast(pl.Float64)
+        if where is not None:
+            expr = expr.filter(where)
+        return expr.sum()
+    
+    def _supplier_filter(self, supplier: str) -> pl.Expr:
+        """Build the case-insensitive supplier predicate"""
+        return resolve_supplier(supplier, self._supplier_names)[1]
+    
+    def _scoped(self, supplier: Optional[str] = None) -> pl.LazyFrame:
+        """
+        Lazy view of the data, optionally restricted to one supplier.
+        
+        The supplier slice is materialized once (keyed by the matched
+        supplier names) and reused by every report that asks for the same
+        suppliers; the least recently used slices are evicted.
+        """
+        if not supplier:
+            return self.lf
+        
+        key, predicate = resolve_supplier(supplier, self._supplier_names)
+        scoped = self._supplier_cache.get(key)
+        if scoped is None:
+            scoped = self._collect(self.lf.filter(predicate))
+            self._supplier_cache.put(key, scoped)
+        return scoped.lazy()
+    
+    # ------------------------------------------------------------------
+    # Lazy plans (one per report); collected together where possible
+    # ------------------------------------------------------------------
+    
+    def _market_overview_plan(self) -> pl.LazyFrame:
+        """
+        Single-row plan with all market-level aggregates.
+        """
+        return self.lf.select([
+            self._sum("Total Sales").alias("total_sales"),
+            self._sum("Quantity").alias("total_units"),
+            pl.len().alias("total_transactions"),
+            pl.col("Store Name").n_unique().alias("unique_stores"),
+            pl.col("Supplier").n_unique().alias("unique_suppliers"),
+            pl.col("Item_Code").n_unique().alias("unique_skus"),
+            pl.col("Total Sales").cast(pl.Float64).mean().alias("avg_transaction_value"),
+            pl.col("realized_unit_price").cast(pl.Float64).mean().alias("avg_unit_price"),
+            pl.col("Date Of Sale").min().alias("start_date"),
+            pl.col("Date Of Sale").max().alias("end_date")
+        ])
+    
+    def _supplier_metrics_plan(self, supplier_filter: pl.Expr) -> pl.LazyFrame:
+        """Single-row plan with supplier aggregates plus the market total"""
+        return self.lf.select([
+            self._sum("Total Sales").alias("market_sales"),
+            self._sum("Total Sales", supplier_filter).alias("total_sales"),
+            self._sum("Quantity", supplier_filter).alias("total_units"),
+            supplier_filter.sum().alias("total_transactions"),
+            pl.col("Item_Code").filter(supplier_filter).n_unique().alias("unique_skus"),
+            pl.col("Store Name").filter(supplier_filter).n_unique().alias("stores_present"),
+            pl.col("realized_unit_price").cast(pl.Float64).filter(supplier_filter).mean().alias("avg_unit_price"),
+            pl.col("Category").filter(supplier_filter).unique().implode().alias("categories")
+        ])
+    
+    def _category_plan(self, supplier: Optional[str] = None) -> pl.LazyFrame:
+        """Sales by category"""
+        return self._scoped(supplier).group_by("Category").agg([
+            self._sum("Total Sales").alias("sales"),
+            self._sum("Quantity").alias("units"),
+            pl.len().alias("transactions"),
+            pl.col("Item_Code").n_unique().alias("unique_skus")
+        ]).sort("sales", descending=True)
+    
+    def _store_rankings_plan(
+        self,
+        supplier: Optional[str] = None,
+        top_n: int = 10
+    ) -> pl.LazyFrame:
+        """Top stores by sales (partial top-k, then order the k rows)"""
+        return self._scoped(supplier).group_by("Store Name").agg([
+            self._sum("Total Sales").alias("sales"),
+            self._sum("Quantity").alias("units"),
+            pl.len().alias("transactions"),
+            pl.col("Item_Code").n_unique().alias("unique_skus")
+        ]).top_k(top_n, by="sales").sort("sales", descending=True)
+    
+    def _top_skus_plan(
+        self,
+        supplier: Optional[str] = None,
+        by: str = "sales",
+        top_n: int = 10
+    ) -> pl.LazyFrame:
+        """Top SKUs by sales or units"""
+        sort_col = "sales" if by == "sales" else "units"
+        
+        return self._scoped(supplier).group_by(["Item_Code", "Description", "Supplier"]).agg([
+            self._sum("Total Sales").alias("sales"),
+            self._sum("Quantity").alias("units"),
+            pl.len().alias("transactions"),
+            pl.col("Store Name").n_unique().alias("stores_present")
+        ]).top_k(top_n, by=sort_col).sort(sort_col, descending=True)
+    
+    def _daily_trends_plan(self, supplier: Optional[str] = None) -> pl.LazyFrame:
+        """Sales by day"""
+        return self._scoped(supplier).group_by("Date Of Sale").agg([
+            self._sum("Total Sales").alias("sales"),
+            self._sum("Quantity").alias("units"),
+            pl.len().alias("transactions")
+        ]).sort("Date Of Sale")
+    
+    # ------------------------------------------------------------------
+    # Shaping materialized frames into report dicts
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _shape_market_overview(stats: pl.DataFrame) -> Dict:
+        """Shape the market overview row into a dict"""
+        row = stats.row(0, named=True)
         return {
-            "total_sales": self.df["Total Sales"].sum(),
-            "total_units": self.df["Quantity"].sum(),
-            "total_transactions": len(self.df),
-            "unique_stores": self.df["Store Name"].n_unique(),
-            "unique_suppliers": self.df["Supplier"].n_unique(),
-            "unique_skus": self.df["Item_Code"].n_unique(),
-            "avg_transaction_value": self.df["Total Sales"].mean(),
-            "avg_unit_price": self.df["realized_unit_price"].mean(),
+            "total_sales": row["total_sales"],
+            "total_units": row["total_units"],
+            "total_transactions": row["total_transactions"],
+            "unique_stores": row["unique_stores"],
+            "unique_suppliers": row["unique_suppliers"],
+            "unique_skus": row["unique_skus"],
+            "avg_transaction_value": row["avg_transaction_value"],
+            "avg_unit_price": row["avg_unit_price"],
             "date_range": {
-                "start": str(self.df["Date Of Sale"].min()),
-                "end": str(self.df["Date Of Sale"].max())
+                "start": str(row["start_date"]),
+                "end": str(row["end_date"])
             }
         }
     
-    def get_supplier_metrics(self, supplier: str = "BIDCO") -> Dict:
-        """Get metrics for a specific supplier"""
-        supplier_df = self.df.filter(
-            pl.col("Supplier").str.to_lowercase().str.contains(supplier.lower())
-        )
-        
-        total_market_sales = self.df["Total Sales"].sum()
-        supplier_sales = supplier_df["Total Sales"].sum()
+    @staticmethod
+    def _shape_supplier_metrics(stats: pl.DataFrame, supplier: str) -> Dict:
+        """Shape the supplier metrics row into a dict"""
+        row = stats.row(0, named=True)
+        total_market_sales = row["market_sales"]
+        supplier_sales = row["total_sales"]
         
         return {
             "supplier": supplier,
             "total_sales": supplier_sales,
-            "total_units": supplier_df["Quantity"].sum(),
-            "total_transactions": len(supplier_df),
+            "total_units": row["total_units"],
+            "total_transactions": row["total_transactions"],
             "market_share_pct": (supplier_sales / total_market_sales * 100) if total_market_sales > 0 else 0,
-            "unique_skus": supplier_df["Item_Code"].n_unique(),
-            "stores_present": supplier_df["Store Name"].n_unique(),
-            "avg_unit_price": supplier_df["realized_unit_price"].mean(),
-            "categories": supplier_df["Category"].unique().to_list()
+            "unique_skus": row["unique_skus"],
+            "stores_present": row["stores_present"],
+            "avg_unit_price": row["avg_unit_price"],
+            "categories": row["categories"]
         }
     
+    @staticmethod
+    def _shape_category_breakdown(category_summary: pl.DataFrame) -> List[Dict]:
+        """Shape category aggregates into a list of dicts"""
+        total_sales = category_summary["sales"].sum()
+        share = (pl.col("sales") / total_sales * 100) if total_sales > 0 else pl.lit(0)
+        
+        return category_summary.select([
+            pl.col("Category").alias("category"),
+            "sales",
+            "units",
+            "transactions",
+            "unique_skus",
+            share.alias("sales_share_pct")
+        ]).to_dicts()
+    
+    @staticmethod
+    def _shape_store_rankings(store_summary: pl.DataFrame) -> List[Dict]:
+        """Shape store aggregates into a list of dicts"""
+        return store_summary.select([
+            pl.col("Store Name").alias("store"),
+            "sales",
+            "units",
+            "transactions",
+            "unique_skus",
+            pl.when(pl.col("transactions") > 0)
+            .then(pl.col("sales") / pl.col("transactions"))
+            .otherwise(0)
+            .alias("avg_transaction_value")
+        ]).to_dicts()
+    
+    @staticmethod
+    def _shape_top_skus(sku_summary: pl.DataFrame) -> List[Dict]:
+        """Shape SKU aggregates into a list of dicts"""
+        return sku_summary.select([
+            pl.col("Item_Code").alias("item_code"),
+            pl.col("Description").alias("description"),
+            pl.col("Supplier").alias("supplier"),
+            "sales",
+            "units",
+            "transactions",
+            "stores_present"
+        ]).to_dicts()
+    
+    @staticmethod
+    def _shape_daily_trends(daily_summary: pl.DataFrame) -> List[Dict]:
+        """Shape daily aggregates into a list of dicts"""
+        return daily_summary.select([
+            pl.col("Date Of Sale").cast(pl.Utf8).alias("date"),
+            "sales",
+            "units",
+            "transactions"
+        ]).to_dicts()
+    
+    # ------------------------------------------------------------------
+    # Public reports
+    # ------------------------------------------------------------------
+    
+    def get_market_overview(self) -> Dict:
+        """Get high-level market metrics"""
+        return self._shape_market_overview(self._collect(self._market_overview_plan()))
+    
+    def get_supplier_metrics(self, supplier: str = "BIDCO") -> Dict:
+        """Get metrics for a specific supplier"""
+        stats = self._collect(self._supplier_metrics_plan(self._supplier_filter(supplier)))
+        return self._shape_supplier_metrics(stats, supplier)
+    
     def get_category_breakdown(self, supplier: Optional[str] = None) -> List[Dict]:
         """Get sales by category"""
-        df = self.df
-        
-        if supplier:
-            df = df.filter(
-                pl.col("Supplier").str.to_lowercase().str.contains(supplier.lower())
-            )
-        
-        category_summary = df.group_by("Category").agg([
-            pl.col("Total Sales").sum().alias("sales"),
-            pl.col("Quantity").sum().alias("units"),
-            pl.len().alias("transactions"),
-            pl.col("Item_Code").n_unique().alias("unique_skus")
-        ]).sort("sales", descending=True)
-        
-        total_sales = df["Total Sales"].sum()
-        
-        results = []
-        for row in category_summary.iter_rows(named=True):
-            results.append({
-                "category": row["Category"],
-                "sales": row["sales"],
-                "units": row["units"],
-                "transactions": row["transactions"],
-                "unique_skus": row["unique_skus"],
-                "sales_share_pct": (row["sales"] / total_sales * 100) if total_sales > 0 else 0
-            })
-        
-        return results
+        return self._shape_category_breakdown(self._collect(self._category_plan(supplier)))
     
     def get_store_rankings(
         self,
@@ -118,32 +295,7 @@ class KPIAggregator:
         top_n: int = 10
     ) -> List[Dict]:
         """Get top stores by sales"""
-        df = self.df
-        
-        if supplier:
-            df = df.filter(
-                pl.col("Supplier").str.to_lowercase().str.contains(supplier.lower())
-            )
-        
-        store_summary = df.group_by("Store Name").agg([
-            pl.col("Total Sales").sum().alias("sales"),
-            pl.col("Quantity").sum().alias("units"),
-            pl.len().alias("transactions"),
-            pl.col("Item_Code").n_unique().alias("unique_skus")
-        ]).sort("sales", descending=True).head(top_n)
-        
-        results = []
-        for row in store_summary.iter_rows(named=True):
-            results.append({
-                "store": row["Store Name"],
-                "sales": row["sales"],
-                "units": row["units"],
-                "transactions": row["transactions"],
-                "unique_skus": row["unique_skus"],
-                "avg_transaction_value": row["sales"] / row["transactions"] if row["transactions"] > 0 else 0
-            })
-        
-        return results
+        return self._shape_store_rankings(self._collect(self._store_rankings_plan(supplier, top_n)))
     
     def get_top_skus(
         self,
@@ -154,72 +306,32 @@ class KPIAggregator:
         """
         Get top SKUs.
         """
-        df = self.df
-        
-        if supplier:
-            df = df.filter(
-                pl.col("Supplier").str.to_lowercase().str.contains(supplier.lower())
-            )
-        
-        sku_summary = df.group_by(["Item_Code", "Description", "Supplier"]).agg([
-            pl.col("Total Sales").sum().alias("sales"),
-            pl.col("Quantity").sum().alias("units"),
-            pl.len().alias("transactions"),
-            pl.col("Store Name").n_unique().alias("stores_present")
-        ])
-        
-        sort_col = "sales" if by == "sales" else "units"
-        sku_summary = sku_summary.sort(sort_col, descending=True).head(top_n)
-        
-        results = []
-        for row in sku_summary.iter_rows(named=True):
-            results.append({
-                "item_code": row["Item_Code"],
-                "description": row["Description"],
-                "supplier": row["Supplier"],
-                "sales": row["sales"],
-                "units": row["units"],
-                "transactions": row["transactions"],
-                "stores_present": row["stores_present"]
-            })
-        
-        return results
+        return self._shape_top_skus(self._collect(self._top_skus_plan(supplier, by, top_n)))
     
     def get_daily_trends(self, supplier: Optional[str] = None) -> List[Dict]:
         """Get daily sales trends"""
-        df = self.df
-        
-        if supplier:
-            df = df.filter(
-                pl.col("Supplier").str.to_lowercase().str.contains(supplier.lower())
-            )
-        
-        daily_summary = df.group_by("Date Of Sale").agg([
-            pl.col("Total Sales").sum().alias("sales"),
-            pl.col("Quantity").sum().alias("units"),
-            pl.len().alias("transactions")
-        ]).sort("Date Of Sale")
-        
-        results = []
-        for row in daily_summary.iter_rows(named=True):
-            results.append({
-                "date": str(row["Date Of Sale"]),
-                "sales": row["sales"],
-                "units": row["units"],
-                "transactions": row["transactions"]
-            })
-        
-        return results
+        return self._shape_daily_trends(self._collect(self._daily_trends_plan(supplier)))
     
     def generate_executive_summary(self, supplier: str = "BIDCO") -> Dict:
         """
         Generate executive summary with all key metrics.
+        
+        All report plans are collected in one `pl.collect_all` call; the
+        per-supplier reports all read the same cached supplier slice.
         """
-        market = self.get_market_overview()
-        supplier_metrics = self.get_supplier_metrics(supplier)
-        categories = self.get_category_breakdown(supplier)
-        top_stores = self.get_store_rankings(supplier, top_n=5)
-        top_products = self.get_top_skus(supplier, top_n=5)
+        market_df, supplier_df, category_df, stores_df, skus_df = pl.collect_all([
+            self._market_overview_plan(),
+            self._supplier_metrics_plan(self._supplier_filter(supplier)),
+            self._category_plan(supplier),
+            self._store_rankings_plan(supplier, top_n=5),
+            self._top_skus_plan(supplier, top_n=5)
+        ], engine=self._engine)
+        
+        market = self._shape_market_overview(market_df)
+        supplier_metrics = self._shape_supplier_metrics(supplier_df, supplier)
+        categories = self._shape_category_breakdown(category_df)
+        top_stores = self._shape_store_rankings(stores_df)
+        top_products = self._shape_top_skus(skus_df)
         
         return {
             "summary_date": str(date.today()),
@@ -249,38 +361,38 @@ def generate_bidco_summary(df: pl.DataFrame) -> Dict:
 
 # if __name__ == "__main__":
 #     """Test KPI aggregation"""
-    
+
 #     print("=" * 80)
 #     print("KPI AGGREGATION TEST")
 #     print("=" * 80)
 #     print()
-    
+
 #     # Load data
 #     data_path = Path(__file__).parent.parent.parent / "data" / "raw" / "Test_Data.xlsx"
 #     print(f"Loading data from {data_path}...")
 #     df = pl.read_excel(data_path)
 #     print(f"Loaded {len(df):,} records")
 #     print()
-    
+
 #     # Generate summary
 #     print("Generating executive summary...")
 #     aggregator = KPIAggregator(df)
 #     summary = aggregator.generate_executive_summary("BIDCO")
 #     print(" Summary generated")
 #     print()
-    
+
 #     # Display results
 #     print("=" * 80)
 #     print(f"EXECUTIVE SUMMARY - {summary['supplier']}")
 #     print(f"Date: {summary['summary_date']}")
 #     print("=" * 80)
 #     print()
-    
+
 #     print("KEY METRICS:")
 #     for metric, value in summary["key_metrics"].items():
 #         print(f"  {metric.replace('_', ' ').title():20s}: {value}")
 #     print()
-    
+
 #     print("MARKET CONTEXT:")
 #     market = summary["market_overview"]
 #     print(f"  Total Market Size: {format_currency(market['total_sales'])}")
@@ -288,24 +400,24 @@ def generate_bidco_summary(df: pl.DataFrame) -> Dict:
 #     print(f"  Total Suppliers: {market['unique_suppliers']}")
 #     print(f"  Date Range: {market['date_range']['start']} to {market['date_range']['end']}")
 #     print()
-    
+
 #     print("CATEGORY PERFORMANCE:")
 #     for cat in summary["category_breakdown"]:
 #         print(f"  {cat['category']:15s}: {format_currency(cat['sales']):>15s} "
 #               f"({cat['sales_share_pct']:5.1f}% of {summary['supplier']} sales)")
 #     print()
-    
+
 #     print("TOP 5 STORES:")
 #     for i, store in enumerate(summary["top_stores"], 1):
 #         print(f"{i}. {store['store']:20s}: {format_currency(store['sales']):>15s} "
 #               f"({store['transactions']:>4,} txns)")
 #     print()
-    
+
 #     print("TOP 5 PRODUCTS:")
 #     for i, product in enumerate(summary["top_products"], 1):
 #         print(f"{i}. {product['description'][:40]:40s}: {format_currency(product['sales']):>15s}")
 #     print()
-    
+
 #     print("=" * 80)
 #     print(" KPI aggregation complete!")
 #     print("=" * 80)
\ No newline at end of file
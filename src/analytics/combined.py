@@ -0,0 +1,25 @@
+"""
+Combined Bidco Analysis
+"""
+
+import polars as pl
+from typing import Dict, Union
+
+from analytics.prepared import PreparedFrame
+from analytics.promotions import PromoDetector
+from analytics.pricing import PriceIndexCalculator
+from analytics.aggregations import KPIAggregator
+
+
+def analyze_bidco(df: Union[pl.DataFrame, pl.LazyFrame]) -> Dict:
+    """
+    Generate the Bidco executive, pricing and promo summaries from one
+    prepared frame.
+    """
+    prepared = PreparedFrame(df)
+    
+    return {
+        "summary": KPIAggregator(prepared).generate_executive_summary("BIDCO"),
+        "pricing": PriceIndexCalculator(prepared).get_price_summary("BIDCO"),
+        "promos": PromoDetector(prepared).get_supplier_summary("BIDCO")
+    }
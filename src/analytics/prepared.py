@@ -0,0 +1,128 @@
+"""
+Shared Data Preparation
+"""
+
+import sys
+import weakref
+from pathlib import Path
+
+# Add src to path for imports
+if __name__ == "__main__":
+    project_root = Path(__file__).parent.parent.parent
+    sys.path.insert(0, str(project_root / "src"))
+
+import polars as pl
+from typing import Optional, Tuple, Union
+
+from config import ANALYSIS_CONFIG, PROMO_CONFIG
+from utils import (
+    scan_source,
+    calculate_realized_price,
+    flag_bidco_products,
+    add_supplier_key,
+    create_competitive_set_key,
+    encode_categoricals,
+    downcast_floats,
+    filter_valid_transactions
+)
+
+
+def prepare_plan(df: Union[pl.DataFrame, pl.LazyFrame]) -> pl.LazyFrame:
+    """
+    Lazy plan adding the derived fields shared by all calculators.
+    """
+    lf = df.lazy()
+    
+    # Add realized price
+    lf = calculate_realized_price(lf)
+    
+    # Flag Bidco products (as a byte column for cheap equality masks)
+    lf = flag_bidco_products(lf)
+    lf = lf.with_columns(pl.col("is_bidco").cast(pl.UInt8))
+    
+    # Discount vs RRP and the promo flag in one projection; the shared
+    # discount expression is evaluated once (common subexpression)
+    discount_pct = (
+        pl.when(pl.col("RRP").is_not_null() & (pl.col("RRP") > 0))
+        .then((pl.col("RRP") - pl.col("realized_unit_price")) / pl.col("RRP") * 100)
+        .otherwise(None)
+    )
+    lf = lf.with_columns([
+        discount_pct.alias("discount_pct"),
+        # No RRP is not a promo; stored as a 0/1 byte for mask arithmetic
+        (discount_pct >= PROMO_CONFIG.discount_threshold_pct)
+        .fill_null(False)
+        .cast(pl.UInt8)
+        .alias("is_promo")
+    ])
+    
+    # Item codes are positive numeric SKUs; a 4-byte key hashes faster
+    lf = lf.with_columns(pl.col("Item_Code").cast(pl.UInt32))
+    
+    # Cache lowercase supplier for filtering
+    lf = add_supplier_key(lf)
+    
+    # Create competitive set key
+    lf = create_competitive_set_key(
+        lf,
+        grouping_cols=ANALYSIS_CONFIG.competitive_grouping
+    )
+    
+    # Encode group keys as categoricals (after the key is built from them)
+    lf = encode_categoricals(lf, ANALYSIS_CONFIG.categorical_columns)
+    
+    # Optionally store measures as Float32 (price and discount are derived in Float64 first)
+    lf = downcast_floats(lf, ANALYSIS_CONFIG.float32_columns)
+    
+    # Filter to valid transactions
+    return filter_valid_transactions(lf, allow_negatives=False, allow_zeros=False)
+
+
+class PreparedFrame:
+    """
+    Transaction data with the shared derivations materialized once.
+    
+    Pass the same instance to several calculators to avoid re-running
+    the preparation for each of them.
+    """
+    
+    # Last (weak source reference, prepared) pair built by `of`; dropped
+    # as soon as the source frame is garbage collected
+    _memo: Optional[Tuple[weakref.ref, "PreparedFrame"]] = None
+    
+    def __init__(self, df: Union[pl.DataFrame, pl.LazyFrame]):
+        """
+        Prepare transaction data (eager or lazy).
+        """
+        engine = "streaming" if isinstance(df, pl.LazyFrame) else "auto"
+        self.df = prepare_plan(df).collect(engine=engine)
+    
+    @classmethod
+    def of(cls, df: pl.DataFrame) -> "PreparedFrame":
+        """
+        Prepared frame for `df`, reusing the last one built for the same
+        input object.
+        """
+        # Weak reference so the memo never keeps the source (or, through
+        # it, the prepared copy) alive after the caller lets go of it
+        memo = cls._memo
+        if memo is None or memo[0]() is not df:
+            memo = (weakref.ref(df, cls._forget), cls(df))
+            cls._memo = memo
+        return memo[1]
+    
+    @classmethod
+    def _forget(cls, ref: weakref.ref) -> None:
+        """Drop the memo once its source frame is collected"""
+        memo = cls._memo
+        if memo is not None and memo[0] is ref:
+            cls._memo = None
+    
+    @classmethod
+    def from_source(cls, path: Union[str, Path]) -> "PreparedFrame":
+        """Prepare data from a lazily scanned file"""
+        return cls(scan_source(path))
+    
+    def lazy(self) -> pl.LazyFrame:
+        """Lazy view over the prepared data"""
+        return self.df.lazy()
@@ -11,21 +11,17 @@ if __name__ == "__main__":
     sys.path.insert(0, str(project_root / "src"))
 
 import polars as pl
-from typing import List, Dict, Optional
+from typing import List, Optional, Tuple, Union
 from datetime import date
 
-from config import PRICE_INDEX_CONFIG, ANALYSIS_CONFIG
+from config import PRICE_INDEX_CONFIG
+from utils import supplier_names, resolve_supplier
 from schema import (
     PriceIndexResult,
     PriceIndexSummary,
     PricePosition
 )
-from utils import (
-    calculate_realized_price,
-    flag_bidco_products,
-    create_competitive_set_key,
-    filter_valid_transactions
-)
+from analytics.prepared import PreparedFrame
 
 
 class PriceIndexCalculator:
@@ -33,72 +29,72 @@ class PriceIndexCalculator:
     Calculates price indices for a target supplier against competitors.
     """
     
-    def __init__(self, df: pl.DataFrame):
+    def __init__(self, df: Union[pl.DataFrame, pl.LazyFrame, PreparedFrame]):
         """
-        Initialize with transaction data.
+        Initialize with transaction data (eager, lazy or already prepared).
         """
-        self.df = df
-        self._prepare_data()
+        if not isinstance(df, PreparedFrame):
+            df = PreparedFrame.of(df)
+        self.df = df.df
+        self._supplier_names = supplier_names(self.df)
     
-    def _prepare_data(self):
-        """Prepare data with necessary derived fields"""
-        # Add realized price
-        self.df = calculate_realized_price(self.df)
-        
-        # Flag Bidco products
-        self.df = flag_bidco_products(self.df)
-        
-        # Create competitive set key
-        self.df = create_competitive_set_key(
-            self.df,
-            grouping_cols=ANALYSIS_CONFIG.competitive_grouping
-        )
-        
-        # Filter to valid transactions
-        self.df = filter_valid_transactions(self.df, allow_negatives=False, allow_zeros=False)
+    @classmethod
+    def from_source(cls, path: Union[str, Path]) -> "PriceIndexCalculator":
+        """Build a calculator from a lazily scanned file"""
+        return cls(PreparedFrame.from_source(path))
     
-    def calculate_price_index(
+    def _target_and_competitor_prices(
         self,
-        target_supplier: str = "BIDCO",
-        by_store: bool = True
-    ) -> pl.DataFrame:
+        target_supplier: str,
+        by_store: bool
+    ) -> Tuple[pl.LazyFrame, pl.LazyFrame, List[str]]:
         """
-        Calculate price index for target supplier vs competitors.
+        Lazy per-SKU target prices and per-set competitor averages, plus
+        the columns that join them.
         """
+        lf = self.df.lazy()
+        
         # Group columns
         if by_store:
             group_cols = ["Store Name", "competitive_set_key", "Item_Code"]
         else:
             group_cols = ["competitive_set_key", "Item_Code"]
         
-        # Calculate average prices per SKU per competitive set (and store if applicable)
-        price_summary = self.df.group_by(group_cols).agg([
+        # Per-SKU price aggregates per competitive set (and store if applicable)
+        sku_price_aggs = [
             pl.col("Description").first(),
             pl.col("Supplier").first(),
             pl.col("Sub-Department").first(),
             pl.col("Section").first(),
             pl.col("is_bidco").first(),
-            pl.col("realized_unit_price").mean().alias("avg_realized_price"),
-            pl.col("RRP").median().alias("median_rrp"),
+            pl.col("realized_unit_price").cast(pl.Float64).mean().alias("avg_realized_price"),
+            pl.col("RRP").cast(pl.Float64).median().alias("median_rrp"),
             pl.len().alias("transaction_count")
-        ])
+        ]
         
-        # Filter to SKUs with minimum transactions
-        price_summary = price_summary.filter(
+        # SKUs need a minimum number of transactions for a reliable price
+        enough_transactions = (
             pl.col("transaction_count") >= PRICE_INDEX_CONFIG.min_transactions_for_price
         )
         
+        # One per-SKU summary shared by both sides, so a SKU sold by several
+        # suppliers is attributed to a single supplier and counted once
+        price_summary = lf.group_by(group_cols).agg(sku_price_aggs).filter(enough_transactions)
+        
         # Calculate competitive set averages (excluding target supplier)
         comp_set_cols = ["competitive_set_key"]
         if by_store:
             comp_set_cols.append("Store Name")
         
         # Get competitor prices (not Bidco)
-        competitor_prices = price_summary.filter(~pl.col("is_bidco")).group_by(comp_set_cols).agg([
-            pl.col("avg_realized_price").mean().alias("competitor_avg_price"),
-            pl.len().alias("competitor_count"),
-            pl.col("transaction_count").sum().alias("competitor_transactions")
-        ])
+        competitor_prices = (
+            price_summary.filter(pl.col("is_bidco") == 0)
+            .group_by(comp_set_cols).agg([
+                pl.col("avg_realized_price").mean().alias("competitor_avg_price"),
+                pl.len().alias("competitor_count"),
+                pl.col("transaction_count").sum().alias("competitor_transactions")
+            ])
+        )
         
         # Filter to competitive sets with minimum competitors
         competitor_prices = competitor_prices.filter(
@@ -106,15 +102,40 @@ class PriceIndexCalculator:
         )
         
         # Get target supplier prices
-        target_prices = price_summary.filter(
-            pl.col("Supplier").str.to_lowercase().str.contains(target_supplier.lower())
+        target_prices = price_summary.filter(resolve_supplier(target_supplier, self._supplier_names)[1])
+        
+        return target_prices, competitor_prices, comp_set_cols
+    
+    def calculate_price_index(
+        self,
+        target_supplier: str = "BIDCO",
+        by_store: bool = True
+    ) -> pl.DataFrame:
+        """
+        Calculate price index for target supplier vs competitors.
+        """
+        return self.calculate_price_index_lazy(target_supplier, by_store).collect()
+    
+    def calculate_price_index_lazy(
+        self,
+        target_supplier: str = "BIDCO",
+        by_store: bool = True
+    ) -> pl.LazyFrame:
+        """
+        Lazy plan for the price index of target supplier vs competitors.
+        
+        Only SKUs whose competitive set has enough competitors are returned;
+        see `count_unmatched_skus` for the rest.
+        """
+        target_prices, competitor_prices, comp_set_cols = self._target_and_competitor_prices(
+            target_supplier, by_store
         )
         
-        # Join target with competitors
+        # Join target with competitors (unmatched SKUs have no index to compute)
         price_index = target_prices.join(
             competitor_prices,
             on=comp_set_cols,
-            how="left"
+            how="inner"
         )
         
         # Calculate price index
@@ -133,9 +154,7 @@ class PriceIndexCalculator:
         
         # Determine price position
         price_index = price_index.with_columns([
-            pl.when(pl.col("price_index").is_null())
-            .then(pl.lit("insufficient_data"))
-            .when(pl.col("price_index") > PRICE_INDEX_CONFIG.premium_threshold)
+            pl.when(pl.col("price_index") > PRICE_INDEX_CONFIG.premium_threshold)
             .then(pl.lit("premium"))
             .when(pl.col("price_index") < PRICE_INDEX_CONFIG.discount_threshold)
             .then(pl.lit("discount"))
@@ -145,6 +164,23 @@ class PriceIndexCalculator:
         
         return price_index
     
+    def count_unmatched_skus(
+        self,
+        target_supplier: str = "BIDCO",
+        by_store: bool = False
+    ) -> int:
+        """
+        Count target SKUs without a large enough competitive set.
+        """
+        return self._unmatched_count_lazy(target_supplier, by_store).collect().item()
+    
+    def _unmatched_count_lazy(self, target_supplier: str, by_store: bool) -> pl.LazyFrame:
+        """Single-cell plan counting target SKUs with no competitive set match"""
+        target_prices, competitor_prices, comp_set_cols = self._target_and_competitor_prices(
+            target_supplier, by_store
+        )
+        return target_prices.join(competitor_prices, on=comp_set_cols, how="anti").select(pl.len())
+    
     def get_price_index_results(
         self,
         target_supplier: str = "BIDCO",
@@ -155,26 +191,30 @@ class PriceIndexCalculator:
         """
         price_data = self.calculate_price_index(target_supplier, by_store)
         
+        # Rename to schema field names in Polars, then convert in bulk
+        rows = price_data.select([
+            pl.col("Item_Code").alias("item_code"),
+            pl.col("Description").alias("description"),
+            pl.col("Supplier").alias("supplier"),
+            (pl.col("Store Name") if by_store else pl.lit(None, dtype=pl.Utf8)).alias("store_name"),
+            pl.col("Sub-Department").alias("sub_department"),
+            pl.col("Section").alias("section"),
+            pl.col("avg_realized_price").alias("bidco_avg_price"),
+            pl.col("median_rrp").alias("bidco_avg_rrp"),
+            pl.col("competitor_avg_price"),
+            pl.col("competitor_count"),
+            pl.col("price_index"),
+            pl.col("price_position"),
+            pl.col("price_vs_rrp_pct"),
+            pl.col("transaction_count").alias("bidco_transaction_count"),
+            pl.col("competitor_transactions").alias("competitor_transaction_count")
+        ]).to_dicts()
+        
+        # Columns are already typed by Polars, so skip per-field validation
         results = []
-        for row in price_data.iter_rows(named=True):
-            result = PriceIndexResult(
-                item_code=row["Item_Code"],
-                description=row["Description"],
-                supplier=row["Supplier"],
-                store_name=row.get("Store Name") if by_store else None,
-                sub_department=row["Sub-Department"],
-                section=row["Section"],
-                bidco_avg_price=row["avg_realized_price"],
-                bidco_avg_rrp=row["median_rrp"],
-                competitor_avg_price=row["competitor_avg_price"],
-                competitor_count=row["competitor_count"],
-                price_index=row["price_index"],
-                price_position=PricePosition(row["price_position"]),
-                price_vs_rrp_pct=row["price_vs_rrp_pct"],
-                bidco_transaction_count=row["transaction_count"],
-                competitor_transaction_count=row["competitor_transactions"]
-            )
-            results.append(result)
+        for row in rows:
+            row["price_position"] = PricePosition(row["price_position"])
+            results.append(PriceIndexResult.model_construct(**row))
         
         return results
     
@@ -185,22 +225,32 @@ class PriceIndexCalculator:
         """
         Get aggregated price index summary.
         """
-        # Get store-level indices
-        store_level = self.calculate_price_index(target_supplier, by_store=True)
-        
-        # Get portfolio-level indices
-        portfolio_level = self.calculate_price_index(target_supplier, by_store=False)
+        # Store-level and portfolio-level indices (plus the unmatched count)
+        # are collected together so Polars runs the plans concurrently
+        store_level, portfolio_level, unmatched = pl.collect_all([
+            self.calculate_price_index_lazy(target_supplier, by_store=True),
+            self.calculate_price_index_lazy(target_supplier, by_store=False),
+            self._unmatched_count_lazy(target_supplier, by_store=False)
+        ])
         
         # Calculate summary statistics
         valid_indices = portfolio_level.filter(pl.col("price_index").is_not_null())
         
         total_skus = len(valid_indices)
-        premium_skus = len(valid_indices.filter(pl.col("price_position") == "premium"))
-        at_market_skus = len(valid_indices.filter(pl.col("price_position") == "at_market"))
-        discount_skus = len(valid_indices.filter(pl.col("price_position") == "discount"))
         
-        avg_index = valid_indices["price_index"].mean() if len(valid_indices) > 0 else 0.0
-        median_index = valid_indices["price_index"].median() if len(valid_indices) > 0 else 0.0
+        # Count SKUs per price position in one pass
+        position_counts = dict(valid_indices.group_by("price_position").len().iter_rows())
+        premium_skus = position_counts.get("premium", 0)
+        at_market_skus = position_counts.get("at_market", 0)
+        discount_skus = position_counts.get("discount", 0)
+        
+        if total_skus > 0:
+            avg_index, median_index = valid_indices.select([
+                pl.col("price_index").mean().alias("avg_index"),
+                pl.col("price_index").median().alias("median_index")
+            ]).row(0)
+        else:
+            avg_index, median_index = 0.0, 0.0
         
         # Store-level indices
         store_indices = {}
@@ -213,16 +263,21 @@ class PriceIndexCalculator:
                 if row["avg_store_index"] is not None:
                     store_indices[row["Store Name"]] = row["avg_store_index"]
         
-        # Category-level indices
+        # Category-level indices, sorted so the extremes are the first/last rows
         category_indices = {}
+        category_extremes = None
         if len(portfolio_level) > 0:
-            category_summary = portfolio_level.group_by("Sub-Department").agg([
-                pl.col("price_index").mean().alias("avg_category_index")
-            ])
+            category_summary = (
+                portfolio_level.group_by("Sub-Department").agg([
+                    pl.col("price_index").mean().alias("avg_category_index")
+                ])
+                .drop_nulls("avg_category_index")
+                .sort("avg_category_index", descending=True)
+            )
             
-            for row in category_summary.iter_rows(named=True):
-                if row["avg_category_index"] is not None:
-                    category_indices[row["Sub-Department"]] = row["avg_category_index"]
+            category_indices = dict(category_summary.iter_rows())
+            if len(category_summary) > 0:
+                category_extremes = (category_summary.row(0), category_summary.row(-1))
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
@@ -231,7 +286,7 @@ class PriceIndexCalculator:
             at_market_skus,
             discount_skus,
             total_skus,
-            category_indices
+            category_extremes
         )
         
         return PriceIndexSummary(
@@ -241,6 +296,7 @@ class PriceIndexCalculator:
             premium_skus=premium_skus,
             at_market_skus=at_market_skus,
             discount_skus=discount_skus,
+            insufficient_data_skus=unmatched.item(),
             avg_price_index=avg_index,
             median_price_index=median_index,
             store_level_indices=store_indices,
@@ -255,7 +311,7 @@ class PriceIndexCalculator:
         at_market_count: int,
         discount_count: int,
         total_count: int,
-        category_indices: Dict[str, float]
+        category_extremes: Optional[Tuple[Tuple[str, float], Tuple[str, float]]]
     ) -> List[str]:
         """Generate pricing recommendations"""
         recommendations = []
@@ -297,9 +353,8 @@ class PriceIndexCalculator:
             )
         
         # Category-specific
-        if category_indices:
-            max_category = max(category_indices.items(), key=lambda x: x[1])
-            min_category = min(category_indices.items(), key=lambda x: x[1])
+        if category_extremes:
+            max_category, min_category = category_extremes
             
             if max_category[1] > 1.2:
                 recommendations.append(
@@ -327,53 +382,53 @@ def analyze_bidco_pricing(df: pl.DataFrame) -> PriceIndexSummary:
 
 # if __name__ == "__main__":
 #     """Test price index calculation"""
-    
+
 #     print("=" * 80)
 #     print("PRICE INDEX CALCULATOR TEST")
 #     print("=" * 80)
 #     print()
-    
+
 #     # Load data
 #     data_path = Path(__file__).parent.parent.parent / "data" / "raw" / "Test_Data.xlsx"
 #     print(f"Loading data from {data_path}...")
 #     df = pl.read_excel(data_path)
 #     print(f"Loaded {len(df):,} records")
 #     print()
-    
+
 #     # Calculate price indices
 #     print("Calculating price indices...")
 #     calculator = PriceIndexCalculator(df)
 #     summary = calculator.get_price_summary("BIDCO")
 #     print("Price analysis complete")
 #     print()
-    
+
 #     # Display results
 #     print("=" * 80)
 #     print("BIDCO PRICE POSITIONING")
 #     print("=" * 80)
 #     print(f"Analysis Date: {summary.analysis_date}")
 #     print()
-    
+
 #     print("PORTFOLIO OVERVIEW:")
 #     print(f"  Total SKUs: {summary.total_skus}")
 #     print(f"  Premium Positioned: {summary.premium_skus} ({summary.premium_skus/summary.total_skus*100:.1f}%)")
 #     print(f"  At Market: {summary.at_market_skus} ({summary.at_market_skus/summary.total_skus*100:.1f}%)")
 #     print(f"  Discount Positioned: {summary.discount_skus} ({summary.discount_skus/summary.total_skus*100:.1f}%)")
 #     print()
-    
+
 #     print("PRICE INDICES:")
 #     print(f"  Average Index: {summary.avg_price_index:.3f}")
 #     print(f"  Median Index: {summary.median_price_index:.3f}")
 #     print(f"  Interpretation: <0.9 discount, 0.9-1.1 at market, >1.1 premium")
 #     print()
-    
+
 #     if summary.category_indices:
 #         print("CATEGORY-LEVEL POSITIONING:")
 #         for category, index in sorted(summary.category_indices.items(), key=lambda x: x[1], reverse=True):
 #             position = "PREMIUM" if index > 1.1 else "DISCOUNT" if index < 0.9 else "AT MARKET"
 #             print(f"  {category:30s}: {index:.3f} ({position})")
 #         print()
-    
+
 #     if summary.store_level_indices:
 #         print(f"STORE-LEVEL VARIANCE (showing top 10):")
 #         sorted_stores = sorted(summary.store_level_indices.items(), key=lambda x: x[1], reverse=True)
@@ -381,13 +436,13 @@ def analyze_bidco_pricing(df: pl.DataFrame) -> PriceIndexSummary:
 #             position = "PREMIUM" if index > 1.1 else "DISCOUNT" if index < 0.9 else "AT MARKET"
 #             print(f"  {store:30s}: {index:.3f} ({position})")
 #         print()
-    
+
 #     if summary.price_opportunities:
 #         print("PRICING RECOMMENDATIONS:")
 #         for i, rec in enumerate(summary.price_opportunities, 1):
 #             print(f"{i}. {rec}")
 #         print()
-    
+
 #     print("=" * 80)
 #     print(" Price index analysis complete!")
 #     print("=" * 80)
\ No newline at end of file
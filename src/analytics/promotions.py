@@ -11,18 +11,64 @@ if __name__ == "__main__":
     sys.path.insert(0, str(project_root / "src"))
 
 import polars as pl
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Hashable, Optional, Tuple, Union
 from datetime import date
+from pydantic import TypeAdapter
 
-from config import PROMO_CONFIG, ANALYSIS_CONFIG
+from config import ANALYSIS_CONFIG
+from utils import LRUCache, supplier_names, resolve_supplier
 from schema import (
     PromoDetectionResult,
-    PromoPerformanceSummary
+    PromoPerformanceSummary,
+    PromoStatus
 )
-from utils import (
-    calculate_realized_price,
-    flag_bidco_products,
-    filter_valid_transactions
+from analytics.prepared import PreparedFrame, prepare_plan
+
+
+# Batch validator for promo result rows (runs in pydantic-core)
+_PROMO_RESULTS_ADAPTER = TypeAdapter(List[PromoDetectionResult])
+
+# Prepared columns read by detection (everything else is projected away)
+_DETECTION_COLUMNS = [
+    "Item_Code", "Description", "Supplier", "_supplier_lc",
+    "Store Name", "Sub-Department", "Section",
+    "Quantity", "Total Sales", "RRP", "realized_unit_price",
+    "discount_pct", "is_promo"
+]
+
+# Insight rules per summary metric: the first matching (predicate, template)
+# wins, mirroring an if/elif chain; metrics that are None are skipped
+_INSIGHT_RULES: Tuple[Tuple[str, Tuple[Tuple[Callable[[float], bool], str], ...]], ...] = (
+    # Promo coverage insight
+    ("promo_pct", (
+        (lambda v: v < 10,
+         "Only {:.1f}% of SKUs are on promotion. Consider expanding promo coverage."),
+        (lambda v: v > 50,
+         "{:.1f}% of SKUs are on promotion. High promotional intensity."),
+    )),
+    # Uplift insight
+    ("avg_uplift", (
+        (lambda v: v < 5,
+         "Low average uplift ({:.1f}%). Promotions may not be deep enough to drive volume."),
+        (lambda v: v > 20,
+         "Strong average uplift ({:.1f}%). Promotions are effectively driving incremental volume."),
+        (lambda v: True,
+         "Moderate average uplift ({:.1f}%). Promotions are having a positive impact."),
+    )),
+    # Discount depth insight
+    ("avg_discount", (
+        (lambda v: v < 15,
+         "Shallow discount depth ({:.1f}%). Consider deeper discounts to maximize impact."),
+        (lambda v: v > 30,
+         "Deep discount depth ({:.1f}%). Review margin impact of heavy discounting."),
+    )),
+    # Store coverage insight
+    ("avg_coverage", (
+        (lambda v: v < 30,
+         "Limited store coverage ({:.1f}%). Promotions are regional rather than national."),
+        (lambda v: v > 70,
+         "High store coverage ({:.1f}%). Promotions are widely distributed."),
+    )),
 )
 
 
@@ -32,46 +78,29 @@ class PromoDetector:
     
     """
     
-    def __init__(self, df: pl.DataFrame):
-        """Initialize with transaction data."""
+    def __init__(self, df: Union[pl.DataFrame, pl.LazyFrame, PreparedFrame]):
+        """Initialize with transaction data (eager, prepared, or lazy to stream from a scan)."""
         self.df = df
+        # Keyed by (matched suppliers, min_stores) and matched suppliers
+        self._promo_cache = LRUCache(ANALYSIS_CONFIG.supplier_cache_size)
+        self._summary_cache = LRUCache(ANALYSIS_CONFIG.supplier_cache_size)
         self._prepare_data()
     
     def _prepare_data(self):
         """Prepare data with necessary derived fields"""
-        # Add realized price
-        self.df = calculate_realized_price(self.df)
-        
-        # Flag Bidco products
-        self.df = flag_bidco_products(self.df)
-        
-        # Filter to valid transactions (positive quantities only)
-        self.df = filter_valid_transactions(
-            self.df, 
-            allow_negatives=False, 
-            allow_zeros=False
-        )
+        if isinstance(self.df, pl.LazyFrame):
+            # Keep preparation in the plan so each detection pushes its
+            # supplier filter and projection down to the scan
+            self.lf = prepare_plan(self.df).select(_DETECTION_COLUMNS)
+            self.df = None
+            self._supplier_names = None
+            return
         
-        # Calculate discount percentage
-        self.df = self.df.with_columns([
-            pl.when(pl.col("RRP").is_not_null() & (pl.col("RRP") > 0))
-            .then(
-                ((pl.col("RRP") - pl.col("realized_unit_price")) / pl.col("RRP") * 100)
-            )
-            .otherwise(None)
-            .alias("discount_pct")
-        ])
-        
-        # Flag promo observations (discount >= threshold)
-        self.df = self.df.with_columns([
-            pl.when(
-                pl.col("discount_pct").is_not_null() & 
-                (pl.col("discount_pct") >= PROMO_CONFIG.discount_threshold_pct)
-            )
-            .then(pl.lit(True))
-            .otherwise(pl.lit(False))
-            .alias("is_promo")
-        ])
+        if not isinstance(self.df, PreparedFrame):
+            self.df = PreparedFrame.of(self.df)
+        self.df = self.df.df
+        self.lf = self.df.lazy().select(_DETECTION_COLUMNS)
+        self._supplier_names = supplier_names(self.df)
     
     def detect_promos_cross_sectional(
         self,
@@ -81,76 +110,132 @@ class PromoDetector:
         """
         Detect promotions using cross-sectional approach.
         
+        The plan runs on the streaming engine, so peak memory is bounded by
+        the group-by state rather than the input. Results are cached per
+        (matched suppliers, min_stores), keeping the most recent ones.
         """
-        df = self.df
+        cache_key = self._cache_key(supplier, min_stores)
+        promos = self._promo_cache.get(cache_key)
+        if promos is None:
+            promos = self._supplier_plan(supplier, min_stores).collect(engine="streaming")
+            self._promo_cache.put(cache_key, promos)
+        return promos
+    
+    def detect_promos_many(
+        self,
+        suppliers: List[str],
+        min_stores: int = 2
+    ) -> Dict[str, pl.DataFrame]:
+        """
+        Detect promotions for several suppliers, running the uncached
+        plans concurrently with `pl.collect_all`.
+        """
+        results = {}
+        missing = {}
+        for supplier in suppliers:
+            cache_key = self._cache_key(supplier, min_stores)
+            promos = self._promo_cache.get(cache_key)
+            if promos is None:
+                missing.setdefault(cache_key, []).append(supplier)
+            else:
+                results[supplier] = promos
+        
+        frames = pl.collect_all(
+            [self._supplier_plan(names[0], min_stores) for names in missing.values()],
+            engine="streaming"
+        )
+        for (cache_key, names), promos in zip(missing.items(), frames):
+            self._promo_cache.put(cache_key, promos)
+            results.update(dict.fromkeys(names, promos))
+        
+        return {s: results[s] for s in suppliers}
+    
+    def _supplier_key(self, supplier: Optional[str]) -> Optional[Hashable]:
+        """Supplier part of the cache keys: the matched names (None for all rows)"""
+        return resolve_supplier(supplier, self._supplier_names)[0] if supplier else None
+    
+    def _cache_key(self, supplier: Optional[str], min_stores: int) -> Tuple[Optional[Hashable], int]:
+        """Detection cache key; spellings matching the same suppliers share it"""
+        return (self._supplier_key(supplier), min_stores)
+    
+    def _supplier_plan(self, supplier: Optional[str], min_stores: int) -> pl.LazyFrame:
+        """Detection plan scoped to one supplier (or all rows)"""
+        lf = self.lf
         
-        # Filter to supplier if specified
+        # Filter to supplier first so detection only aggregates its rows
         if supplier:
-            df = df.filter(
-                pl.col("Supplier").str.to_lowercase().str.contains(supplier.lower())
-            )
+            lf = lf.filter(resolve_supplier(supplier, self._supplier_names)[1])
+        
+        return self._detect_promos_lazy(lf, min_stores)
+    
+    def _detect_promos_lazy(self, lf: pl.LazyFrame, min_stores: int = 2) -> pl.LazyFrame:
+        """
+        Lazy cross-sectional detection plan over the given (pre-filtered) rows.
+        """
+        sku_keys = ["Item_Code", "Description", "Supplier"]
         
         # Aggregate by SKU and Store, then classify as promo or baseline
-        store_sku_summary = df.group_by(["Item_Code", "Description", "Supplier", "Store Name"]).agg([
-            pl.col("Quantity").sum().alias("total_units"),
-            pl.col("Total Sales").sum().alias("total_sales"),
-            pl.col("realized_unit_price").mean().alias("avg_price"),
-            pl.col("RRP").median().alias("median_rrp"),
+        store_sku_summary = lf.group_by(
+            sku_keys + ["Store Name"], maintain_order=False
+        ).agg([
+            pl.col("Sub-Department").first(),
+            pl.col("Section").first(),
+            pl.col("Quantity").cast(pl.Float64).sum().alias("total_units"),  # Float64 accumulator
+            pl.col("Total Sales").cast(pl.Float64).sum().alias("total_sales"),
+            pl.col("realized_unit_price").cast(pl.Float64).mean().alias("avg_price"),
             pl.col("discount_pct").mean().alias("avg_discount_pct"),
             pl.col("is_promo").max().alias("store_has_promo"),  # If any promo, flag store
             pl.len().alias("transaction_count")
         ])
         
-        # Now aggregate across stores to compare promo stores vs baseline stores
-        sku_analysis = store_sku_summary.group_by(["Item_Code", "Description", "Supplier"]).agg([
+        # Now aggregate across stores to compare promo stores vs baseline stores.
+        # Each row is one store, so store counts are mask sums and means are
+        # masked sums over masked counts (branchless, no null-padded columns)
+        promo = pl.col("store_has_promo")
+        baseline = 1 - promo
+        promo_discounted = promo * pl.col("avg_discount_pct").is_not_null().cast(pl.UInt32)
+        
+        sku_analysis = store_sku_summary.group_by(sku_keys, maintain_order=False).agg([
+            pl.col("Sub-Department").first(),
+            pl.col("Section").first(),
+            
             # Promo stores metrics
-            pl.when(pl.col("store_has_promo"))
-            .then(pl.col("total_units"))
-            .otherwise(None)
-            .sum()
-            .alias("promo_units"),
+            (pl.col("total_units") * promo).sum().alias("promo_units"),
+            promo.sum().alias("promo_stores"),
+            (pl.col("avg_price") * promo).sum().alias("_promo_price_sum"),
+            (pl.col("avg_discount_pct").fill_null(0) * promo).sum().alias("_promo_discount_sum"),
+            promo_discounted.sum().alias("_promo_discount_count"),
             
-            pl.when(pl.col("store_has_promo"))
-            .then(pl.col("Store Name"))
-            .otherwise(None)
-            .n_unique()
-            .alias("promo_stores"),
+            # Baseline stores metrics
+            (pl.col("total_units") * baseline).sum().alias("baseline_units"),
+            baseline.sum().alias("baseline_stores"),
+            (pl.col("avg_price") * baseline).sum().alias("_baseline_price_sum"),
             
-            pl.when(pl.col("store_has_promo"))
-            .then(pl.col("avg_price"))
-            .otherwise(None)
-            .mean()
+            # Overall metrics
+            pl.len().alias("total_stores")
+        ])
+        
+        # Per-SKU means from the masked sums (null when no stores qualify)
+        sku_analysis = sku_analysis.with_columns([
+            pl.when(pl.col("promo_stores") > 0)
+            .then(pl.col("_promo_price_sum") / pl.col("promo_stores"))
             .alias("avg_promo_price"),
             
-            pl.when(pl.col("store_has_promo"))
-            .then(pl.col("avg_discount_pct"))
-            .otherwise(None)
-            .mean()
+            pl.when(pl.col("_promo_discount_count") > 0)
+            .then(pl.col("_promo_discount_sum") / pl.col("_promo_discount_count"))
             .alias("avg_promo_discount"),
             
-            # Baseline stores metrics
-            pl.when(~pl.col("store_has_promo"))
-            .then(pl.col("total_units"))
-            .otherwise(None)
-            .sum()
-            .alias("baseline_units"),
-            
-            pl.when(~pl.col("store_has_promo"))
-            .then(pl.col("Store Name"))
-            .otherwise(None)
-            .n_unique()
-            .alias("baseline_stores"),
-            
-            pl.when(~pl.col("store_has_promo"))
-            .then(pl.col("avg_price"))
-            .otherwise(None)
-            .mean()
-            .alias("avg_baseline_price"),
-            
-            # Overall metrics
-            pl.col("Store Name").n_unique().alias("total_stores"),
-            pl.col("median_rrp").median().alias("median_rrp")
-        ])
+            pl.when(pl.col("baseline_stores") > 0)
+            .then(pl.col("_baseline_price_sum") / pl.col("baseline_stores"))
+            .alias("avg_baseline_price")
+        ]).drop(["_promo_price_sum", "_promo_discount_sum", "_promo_discount_count", "_baseline_price_sum"])
+        
+        # Median RRP over the SKU's transactions (not a median of store medians)
+        sku_rrp = lf.group_by(sku_keys, maintain_order=False).agg(
+            pl.col("RRP").cast(pl.Float64).median().alias("median_rrp")
+        )
+        # Null keys (e.g. a missing Supplier) form groups too, so match them
+        sku_analysis = sku_analysis.join(sku_rrp, on=sku_keys, how="left", nulls_equal=True)
         
         # Calculate uplift and coverage
         sku_analysis = sku_analysis.with_columns([
@@ -162,10 +247,10 @@ class PromoDetector:
                 (pl.col("promo_stores") >= 1)
             )
             .then(
-                # Average units per store for fair comparison
-                ((pl.col("promo_units") / pl.col("promo_stores")) - 
-                 (pl.col("baseline_units") / pl.col("baseline_stores"))) /
-                (pl.col("baseline_units") / pl.col("baseline_stores")) * 100
+                # Average units per store for fair comparison:
+                # (promo/promo_stores) / (baseline/baseline_stores) - 1, as %
+                (pl.col("promo_units") * pl.col("baseline_stores")) /
+                (pl.col("baseline_units") * pl.col("promo_stores")) * 100 - 100
             )
             .otherwise(None)
             .alias("promo_uplift_pct"),
@@ -212,28 +297,29 @@ class PromoDetector:
                 (pl.col("promo_uplift_pct") >= min_uplift)
             )
         
-        results = []
-        for row in promo_data.iter_rows(named=True):
-            result = PromoDetectionResult(
-                item_code=row["Item_Code"],
-                description=row["Description"],
-                supplier=row["Supplier"],
-                promo_status="on_promo",
-                promo_stores=row["promo_stores"],
-                baseline_stores=row["baseline_stores"],
-                total_stores=row["total_stores"],
-                promo_units=row["promo_units"],
-                baseline_units=row["baseline_units"],
-                promo_uplift_pct=row["promo_uplift_pct"],
-                avg_promo_price=row["avg_promo_price"],
-                avg_baseline_price=row["avg_baseline_price"],
-                avg_discount_pct=row["avg_promo_discount"],
-                promo_coverage_pct=row["promo_coverage_pct"],
-                median_rrp=row["median_rrp"]
-            )
-            results.append(result)
+        # Rename to schema field names in Polars, then convert in bulk
+        rows = promo_data.select([
+            pl.col("Item_Code").alias("item_code"),
+            pl.col("Description").alias("description"),
+            pl.col("Supplier").alias("supplier"),
+            pl.col("Sub-Department").alias("sub_department"),
+            pl.col("Section").alias("section"),
+            pl.lit(PromoStatus.ON_PROMO.value).alias("promo_status"),
+            "promo_stores",
+            "baseline_stores",
+            "total_stores",
+            "promo_units",
+            "baseline_units",
+            "promo_uplift_pct",
+            "avg_promo_price",
+            "avg_baseline_price",
+            pl.col("avg_promo_discount").alias("avg_discount_pct"),
+            "promo_coverage_pct",
+            "median_rrp"
+        ]).to_dicts()
         
-        return results
+        # Validate the whole batch in one call instead of per-row models
+        return _PROMO_RESULTS_ADAPTER.validate_python(rows)
     
     def get_supplier_summary(
         self,
@@ -241,43 +327,70 @@ class PromoDetector:
     ) -> PromoPerformanceSummary:
         """
         Get promotional performance summary for a supplier.
+        
+        Summaries are cached per matched supplier set and share the
+        detection cache with `get_promo_results`.
         """
+        summary_key = self._supplier_key(supplier)
+        cached = self._summary_cache.get(summary_key)
+        if cached is not None:
+            # Same suppliers under another spelling: echo the requested name
+            if cached.supplier != supplier:
+                cached = cached.model_copy(update={"supplier": supplier})
+            return cached
+        
         # Get all promo results
         promo_data = self.detect_promos_cross_sectional(supplier)
         
-        # Get overall portfolio stats
-        total_skus = len(promo_data)
-        on_promo = promo_data.filter(pl.col("promo_status") == "on_promo")
-        skus_on_promo = len(on_promo)
-        
-        # Calculate average metrics (only for SKUs on promo)
-        if len(on_promo) > 0:
-            avg_uplift = on_promo["promo_uplift_pct"].mean()
-            median_uplift = on_promo["promo_uplift_pct"].median()
-            avg_discount = on_promo["avg_promo_discount"].mean()
-            avg_coverage = on_promo["promo_coverage_pct"].mean()
-            
-            # Get top performers (by uplift, with minimum volume)
-            top_performers = on_promo.filter(
-                pl.col("promo_units") >= 50  # Minimum 50 units for significance
-            ).sort("promo_uplift_pct", descending=True).head(10)
-            
+        if promo_data.is_empty():
+            # No SKUs matched: skip the aggregates entirely
+            total_skus = skus_on_promo = 0
+            avg_uplift = median_uplift = avg_discount = avg_coverage = None
             top_skus = []
-            for row in top_performers.iter_rows(named=True):
-                top_skus.append({
-                    "item_code": row["Item_Code"],
-                    "description": row["Description"],
-                    "uplift_pct": row["promo_uplift_pct"],
-                    "promo_units": row["promo_units"],
-                    "discount_pct": row["avg_promo_discount"],
-                    "coverage_pct": row["promo_coverage_pct"]
-                })
         else:
-            avg_uplift = None
-            median_uplift = None
-            avg_discount = None
-            avg_coverage = None
-            top_skus = []
+            on_promo = pl.col("promo_status") == "on_promo"
+            
+            # Top performers (by uplift, with minimum volume) as result rows
+            uplift = pl.col("promo_uplift_pct")
+            significant = on_promo & (pl.col("promo_units") >= 50)  # Minimum 50 units for significance
+            top_skus_expr = (
+                pl.struct([
+                    pl.col("Item_Code").alias("item_code"),
+                    pl.col("Description").alias("description"),
+                    uplift.alias("uplift_pct"),
+                    "promo_units",
+                    pl.col("avg_promo_discount").alias("discount_pct"),
+                    pl.col("promo_coverage_pct").alias("coverage_pct")
+                ])
+                .filter(significant)
+                .top_k_by(
+                    [uplift.filter(significant), pl.col("Item_Code").filter(significant)],
+                    10,
+                    reverse=[False, True]  # ties go to the lower item code
+                )
+            )
+            
+            # Portfolio counts, on-promo averages and the top-k in one pass
+            # (averages are null when nothing is on promo)
+            (total_skus, skus_on_promo, avg_uplift, median_uplift, avg_discount,
+             avg_coverage, top_skus) = (
+                promo_data.select([
+                    pl.len().alias("total_skus"),
+                    on_promo.sum().alias("skus_on_promo"),
+                    uplift.filter(on_promo).mean().alias("avg_uplift"),
+                    uplift.filter(on_promo).median().alias("median_uplift"),
+                    pl.col("avg_promo_discount").filter(on_promo).mean().alias("avg_discount"),
+                    pl.col("promo_coverage_pct").filter(on_promo).mean().alias("avg_coverage"),
+                    top_skus_expr.implode().alias("top_skus")
+                ]).row(0)
+            )
+            
+            # Partial top-k is unordered; rank the (at most 10) rows here,
+            # breaking uplift ties on item code so the order is stable
+            # (a null uplift sorts last, as in a descending Polars sort)
+            top_skus.sort(key=lambda sku: (
+                sku["uplift_pct"] is None, -(sku["uplift_pct"] or 0.0), sku["item_code"]
+            ))
         
         # Generate insights
         insights = self._generate_insights(
@@ -288,7 +401,7 @@ class PromoDetector:
             avg_coverage
         )
         
-        return PromoPerformanceSummary(
+        summary = PromoPerformanceSummary(
             supplier=supplier,
             analysis_date=date.today(),
             total_skus=total_skus,
@@ -302,6 +415,20 @@ class PromoDetector:
             insights=insights,
             methodology="cross_sectional"
         )
+        
+        self._summary_cache.put(summary_key, summary)
+        return summary
+    
+    def get_supplier_summaries(
+        self,
+        suppliers: List[str]
+    ) -> Dict[str, PromoPerformanceSummary]:
+        """
+        Get promotional performance summaries for several suppliers.
+        """
+        # Detect all suppliers in one concurrent batch; summaries hit the cache
+        self.detect_promos_many(suppliers)
+        return {supplier: self.get_supplier_summary(supplier) for supplier in suppliers}
     
     def _generate_insights(
         self,
@@ -318,63 +445,21 @@ class PromoDetector:
             insights.append("No SKUs found for analysis.")
             return insights
         
-        promo_pct = (skus_on_promo / total_skus) * 100
-        
-        # Promo coverage insight
-        if promo_pct < 10:
-            insights.append(
-                f"Only {promo_pct:.1f}% of SKUs are on promotion. "
-                "Consider expanding promo coverage."
-            )
-        elif promo_pct > 50:
-            insights.append(
-                f"{promo_pct:.1f}% of SKUs are on promotion. "
-                "High promotional intensity."
-            )
-        
-        # Uplift insight
-        if avg_uplift is not None:
-            if avg_uplift < 5:
-                insights.append(
-                    f"Low average uplift ({avg_uplift:.1f}%). "
-                    "Promotions may not be deep enough to drive volume."
-                )
-            elif avg_uplift > 20:
-                insights.append(
-                    f"Strong average uplift ({avg_uplift:.1f}%). "
-                    "Promotions are effectively driving incremental volume."
-                )
-            else:
-                insights.append(
-                    f"Moderate average uplift ({avg_uplift:.1f}%). "
-                    "Promotions are having a positive impact."
-                )
-        
-        # Discount depth insight
-        if avg_discount is not None:
-            if avg_discount < 15:
-                insights.append(
-                    f"Shallow discount depth ({avg_discount:.1f}%). "
-                    "Consider deeper discounts to maximize impact."
-                )
-            elif avg_discount > 30:
-                insights.append(
-                    f"Deep discount depth ({avg_discount:.1f}%). "
-                    "Review margin impact of heavy discounting."
-                )
+        metrics = {
+            "promo_pct": (skus_on_promo / total_skus) * 100,
+            "avg_uplift": avg_uplift,
+            "avg_discount": avg_discount,
+            "avg_coverage": avg_coverage
+        }
         
-        # Store coverage insight
-        if avg_coverage is not None:
-            if avg_coverage < 30:
-                insights.append(
-                    f"Limited store coverage ({avg_coverage:.1f}%). "
-                    "Promotions are regional rather than national."
-                )
-            elif avg_coverage > 70:
-                insights.append(
-                    f"High store coverage ({avg_coverage:.1f}%). "
-                    "Promotions are widely distributed."
-                )
+        for metric, rules in _INSIGHT_RULES:
+            value = metrics[metric]
+            if value is None:
+                continue
+            for predicate, template in rules:
+                if predicate(value):
+                    insights.append(template.format(value))
+                    break
         
         return insights
 
@@ -391,31 +476,31 @@ def analyze_bidco_promos(df: pl.DataFrame) -> PromoPerformanceSummary:
 
 # if __name__ == "__main__":
 #     """Test promotional analysis with cross-sectional approach"""
-    
+
 #     print("=" * 80)
 #     print("PROMOTIONAL ANALYSIS TEST - CROSS-SECTIONAL APPROACH")
 #     print("=" * 80)
 #     print()
-    
+
 #     print("METHODOLOGY:")
 #     print("  Comparing stores WITH promos vs stores WITHOUT promos for same SKUs")
 #     print("  (Cross-sectional comparison, not time-series)")
 #     print()
-    
+
 #     # Load data
 #     data_path = Path(__file__).parent.parent.parent / "data" / "raw" / "Test_Data.xlsx"
 #     print(f"Loading data from {data_path}...")
 #     df = pl.read_excel(data_path)
 #     print(f"Loaded {len(df):,} records")
 #     print()
-    
+
 #     # Analyze promotions
 #     print("Detecting promotions...")
 #     detector = PromoDetector(df)
 #     summary = detector.get_supplier_summary("BIDCO")
 #     print("Promotional analysis complete")
 #     print()
-    
+
 #     # Display results
 #     print("=" * 80)
 #     print("BIDCO PROMOTIONAL PERFORMANCE")
@@ -423,12 +508,12 @@ def analyze_bidco_promos(df: pl.DataFrame) -> PromoPerformanceSummary:
 #     print(f"Analysis Date: {summary.analysis_date}")
 #     print(f"Methodology: {summary.methodology.upper()}")
 #     print()
-    
+
 #     print("PORTFOLIO OVERVIEW:")
 #     print(f"  Total SKUs: {summary.total_skus}")
 #     print(f"  SKUs on Promo: {summary.skus_on_promo} ({summary.promo_sku_pct:.1f}%)")
 #     print()
-    
+
 #     if summary.skus_on_promo > 0:
 #         print("PERFORMANCE METRICS:")
 #         if summary.avg_uplift_pct is not None:
@@ -439,7 +524,7 @@ def analyze_bidco_promos(df: pl.DataFrame) -> PromoPerformanceSummary:
 #         if summary.avg_promo_coverage_pct is not None:
 #             print(f"  Average Coverage: {summary.avg_promo_coverage_pct:.1f}% of stores")
 #         print()
-        
+
 #         if summary.top_performing_skus:
 #             print("TOP PERFORMING SKUs:")
 #             for i, sku in enumerate(summary.top_performing_skus[:5], 1):
@@ -449,13 +534,13 @@ def analyze_bidco_promos(df: pl.DataFrame) -> PromoPerformanceSummary:
 #                       f"Discount: {sku['discount_pct']:>5.1f}% | "
 #                       f"Coverage: {sku['coverage_pct']:>5.1f}%")
 #             print()
-    
+
 #     if summary.insights:
 #         print("KEY INSIGHTS:")
 #         for i, insight in enumerate(summary.insights, 1):
 #             print(f"{i}. {insight}")
 #         print()
-    
+
 #     print("=" * 80)
 #     print("Promotional analysis complete!")
 #     print("=" * 80)
\ No newline at end of file
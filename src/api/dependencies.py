@@ -3,31 +3,94 @@ API Dependencies
 ================
 Dependency injection for FastAPI routes.
 """
+import asyncio
+import hashlib
+import os
+import threading
+import orjson
 import polars as pl
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
+from typing import Any, Callable
+
+from config import ANALYSIS_CONFIG, QUALITY_CONFIG, RAW_DATA_DIR
+from utils import read_workbook
+from schema import DataQualityReport
+from quality import generate_quality_report
+from analytics.prepared import PreparedFrame
+from analytics.promotions import PromoDetector
+from analytics.pricing import PriceIndexCalculator
+from analytics.aggregations import KPIAggregator
+from api.quality_views import QualityViews
+
+# Raw workbook served by the API
+DATA_PATH = RAW_DATA_DIR / "Test_Data.xlsx"
+
+# Bump when the quality report code or layout changes, so snapshots
+# written by an older build are rebuilt rather than served
+_REPORT_SNAPSHOT_VERSION = "1"
 
 # Global data store
 _df = None
 
+# Analytics singletons, built once over the process-wide frame
+_prepared = None
+_promo_detector = None
+_price_calculator = None
+_kpi_aggregator = None
+_quality_report = None
+_quality_views = None
+
+# Guards the lazy singletons: routes run on the pool below, so two first
+# requests could otherwise build the same object concurrently. Re-entrant
+# because the getters build their dependencies through each other.
+_init_lock = threading.RLock()
+
+# Shared pool for blocking analytics calls made from async routes
+# (Polars releases the GIL, so requests run in parallel on it)
+_executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="analytics")
+
+def _read_cached(data_path: Path) -> pl.DataFrame:
+    """
+    Read the Excel file through a Parquet copy kept next to it.
+    
+    The copy is rebuilt whenever the workbook is newer, so later
+    starts skip the Excel parse and memory-map the columnar file.
+    """
+    parquet_path = data_path.with_suffix(".parquet")
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= data_path.stat().st_mtime:
+        return pl.read_parquet(parquet_path, memory_map=True)
+    
+    df = read_workbook(data_path, columns=ANALYSIS_CONFIG.source_columns)
+    try:
+        df.write_parquet(parquet_path, compression="zstd", statistics=True)
+    except OSError as e:
+        # A read-only data directory only costs the cache, not the load
+        print(f"Could not cache {parquet_path.name}: {e}")
+    return df
+
+
 def load_data():
-    """Load data from Excel file"""
+    """Load data from Excel file (via the Parquet cache)"""
     global _df
-    if _df is None:
-        # Calculate data path from this file's location
-        # api/dependencies.py -> src/api -> src -> project_root -> data/raw
-        project_root = Path(__file__).resolve().parent.parent.parent
-        data_path = project_root / "data" / "raw" / "Test_Data.xlsx"
-        
-        try:
-            print(f"Loading data from {data_path}...")
-            _df = pl.read_excel(data_path)
-            print(f"Loaded {len(_df):,} records")
-        except Exception as e:
-            print(f"Failed to load data: {e}")
-            print(f" Please ensure Test_Data.xlsx is at: {data_path}")
-            _df = pl.DataFrame()
+    if _df is not None:
+        return _df
+    
+    with _init_lock:
+        if _df is None:
+            data_path = DATA_PATH
+            
+            try:
+                print(f"Loading data from {data_path}...")
+                _df = _read_cached(data_path)
+                print(f"Loaded {len(_df):,} records")
+            except Exception as e:
+                print(f"Failed to load data: {e}")
+                print(f" Please ensure Test_Data.xlsx is at: {data_path}")
+                _df = pl.DataFrame()
     return _df
-  
+
 
 def get_df() -> pl.DataFrame:
     """
@@ -40,4 +103,122 @@ def get_df() -> pl.DataFrame:
     """
     if _df is None:
         load_data()
-    return _df
\ No newline at end of file
+    return _df
+
+
+def _snapshot_key(data_path: Path) -> str:
+    """
+    Key for derived snapshots: workbook mtime and size (the same
+    freshness test as `_read_cached`), report version and quality settings.
+    """
+    stat = data_path.stat()
+    digest = hashlib.blake2b(f"{stat.st_mtime_ns}:{stat.st_size}".encode(), digest_size=16)
+    digest.update(_REPORT_SNAPSHOT_VERSION.encode())
+    digest.update(QUALITY_CONFIG.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def _load_quality_report(df: pl.DataFrame) -> DataQualityReport:
+    """
+    Quality report via a JSON snapshot kept next to the workbook.
+    
+    The snapshot is reused while the workbook and the quality settings
+    are unchanged, so restarts skip rescoring the data. A restored report
+    is dated today, like a freshly scored one.
+    """
+    try:
+        key = _snapshot_key(DATA_PATH)
+    except OSError:
+        return generate_quality_report(df)
+    
+    snapshot_path = DATA_PATH.with_suffix(".quality.json")
+    if snapshot_path.exists():
+        try:
+            snapshot = orjson.loads(snapshot_path.read_bytes())
+            if isinstance(snapshot, dict) and snapshot.get("key") == key:
+                report = DataQualityReport.model_validate(snapshot["report"])
+                return report.model_copy(update={"report_date": date.today()})
+        except Exception as e:
+            # Unreadable or malformed snapshot: treat it as a miss and rebuild
+            print(f"Ignoring {snapshot_path.name}: {e}")
+    
+    report = generate_quality_report(df)
+    try:
+        snapshot_path.write_bytes(
+            orjson.dumps({"key": key, "report": report.model_dump(mode="json")})
+        )
+    except OSError as e:
+        print(f"Could not cache {snapshot_path.name}: {e}")
+    return report
+
+
+def get_cached_quality_report() -> DataQualityReport:
+    """
+    Dependency that provides the quality report for the loaded data.
+    
+    The data is loaded once per process, so the report is built on
+    first use (or restored from its snapshot) and shared by every
+    quality route.
+    """
+    global _quality_report
+    if _quality_report is None:
+        with _init_lock:
+            if _quality_report is None:
+                _quality_report = _load_quality_report(get_df())
+    return _quality_report
+
+
+def get_quality_views() -> QualityViews:
+    """Dependency that provides the quality route payloads, built once"""
+    global _quality_views
+    if _quality_views is None:
+        with _init_lock:
+            if _quality_views is None:
+                _quality_views = QualityViews(get_cached_quality_report())
+    return _quality_views
+
+
+def get_prepared_frame() -> PreparedFrame:
+    """Dependency that provides the shared prepared frame"""
+    global _prepared
+    if _prepared is None:
+        with _init_lock:
+            if _prepared is None:
+                _prepared = PreparedFrame.of(get_df())
+    return _prepared
+
+
+def get_promo_detector() -> PromoDetector:
+    """Dependency that provides the shared promo detector"""
+    global _promo_detector
+    if _promo_detector is None:
+        with _init_lock:
+            if _promo_detector is None:
+                _promo_detector = PromoDetector(get_prepared_frame())
+    return _promo_detector
+
+
+def get_price_calculator() -> PriceIndexCalculator:
+    """Dependency that provides the shared price index calculator"""
+    global _price_calculator
+    if _price_calculator is None:
+        with _init_lock:
+            if _price_calculator is None:
+                _price_calculator = PriceIndexCalculator(get_prepared_frame())
+    return _price_calculator
+
+
+def get_kpi_aggregator() -> KPIAggregator:
+    """Dependency that provides the shared KPI aggregator"""
+    global _kpi_aggregator
+    if _kpi_aggregator is None:
+        with _init_lock:
+            if _kpi_aggregator is None:
+                _kpi_aggregator = KPIAggregator(get_prepared_frame())
+    return _kpi_aggregator
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking analytics call on the shared pool, off the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, func, *args)
@@ -1,52 +1,55 @@
 """
 Dashboard Endpoint (Combined Analytics)
 """
+import asyncio
+
 from fastapi import APIRouter, HTTPException, Depends
-import polars as pl
 
-from schema import MetricsResponse
-from quality import generate_quality_report
 from analytics.promotions import PromoDetector
 from analytics.pricing import PriceIndexCalculator
 from analytics.aggregations import KPIAggregator
 from utils import get_timestamp
-from api.dependencies import get_df
+from api.responses import metrics_response
+from api.dependencies import (
+    get_quality_views,
+    get_promo_detector,
+    get_price_calculator,
+    get_kpi_aggregator,
+    run_blocking
+)
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
 @router.get("/{supplier_name}")
-async def get_dashboard(supplier_name: str = "BIDCO", df: pl.DataFrame = Depends(get_df)):
+async def get_dashboard(
+    supplier_name: str = "BIDCO",
+    promo_detector: PromoDetector = Depends(get_promo_detector),
+    price_calculator: PriceIndexCalculator = Depends(get_price_calculator),
+    kpi_aggregator: KPIAggregator = Depends(get_kpi_aggregator)
+):
     """
     Get complete dashboard data for a supplier.
     """
     try:
-        # Quality
-        quality_report = generate_quality_report(df)
-        supplier_quality = [
-            s for s in quality_report.supplier_scores 
-            if supplier_name.lower() in s.entity_name.lower()
-        ]
-        
-        # Promos
-        promo_detector = PromoDetector(df)
-        promo_summary = promo_detector.get_supplier_summary(supplier_name)
-        
-        # Pricing
-        price_calculator = PriceIndexCalculator(df)
-        price_summary = price_calculator.get_price_summary(supplier_name)
+        # Run the independent analyses concurrently; Polars releases the
+        # GIL, so worker threads overlap instead of queuing on the loop
+        quality_views, promo_summary, price_summary, kpi_summary = await asyncio.gather(
+            run_blocking(get_quality_views),
+            run_blocking(promo_detector.get_supplier_summary, supplier_name),
+            run_blocking(price_calculator.get_price_summary, supplier_name),
+            run_blocking(kpi_aggregator.generate_executive_summary, supplier_name)
+        )
         
-        # KPIs
-        kpi_aggregator = KPIAggregator(df)
-        kpi_summary = kpi_aggregator.generate_executive_summary(supplier_name)
+        supplier_quality = quality_views.find_supplier(supplier_name) or {}
         
-        return MetricsResponse(
+        return metrics_response(
             success=True,
             data={
                 "supplier": supplier_name,
                 "quality": {
-                    "overall_score": supplier_quality[0].overall_score if supplier_quality else None,
-                    "grade": supplier_quality[0].grade if supplier_quality else None,
-                    "is_trusted": supplier_quality[0].is_trusted if supplier_quality else None
+                    "overall_score": supplier_quality.get("overall_score"),
+                    "grade": supplier_quality.get("grade"),
+                    "is_trusted": supplier_quality.get("is_trusted")
                 },
                 "promos": {
                     "skus_on_promo": promo_summary.skus_on_promo,
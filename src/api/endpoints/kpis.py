@@ -2,23 +2,21 @@
 KPI Endpoints
 """
 from fastapi import APIRouter, HTTPException, Depends
-import polars as pl
 
-from schema import MetricsResponse
 from analytics.aggregations import KPIAggregator
 from utils import get_timestamp
-from api.dependencies import get_df
+from api.responses import metrics_response
+from api.dependencies import get_kpi_aggregator, run_blocking
 
 router = APIRouter(prefix="/api/kpis", tags=["kpis"])
 
 @router.get("/market")
-async def get_market_overview(df: pl.DataFrame = Depends(get_df)):
+async def get_market_overview(aggregator: KPIAggregator = Depends(get_kpi_aggregator)):
     """Get overall market metrics"""
     try:
-        aggregator = KPIAggregator(df)
-        market = aggregator.get_market_overview()
+        market = await run_blocking(aggregator.get_market_overview)
         
-        return MetricsResponse(
+        return metrics_response(
             success=True,
             data=market,
             timestamp=get_timestamp()
@@ -27,15 +25,17 @@ async def get_market_overview(df: pl.DataFrame = Depends(get_df)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{supplier_name}")
-async def get_supplier_kpis(supplier_name: str = "BIDCO", df: pl.DataFrame = Depends(get_df)):
+async def get_supplier_kpis(
+    supplier_name: str = "BIDCO",
+    aggregator: KPIAggregator = Depends(get_kpi_aggregator)
+):
     """
     Get KPIs for a specific supplier.
     """
     try:
-        aggregator = KPIAggregator(df)
-        metrics = aggregator.get_supplier_metrics(supplier_name)
+        metrics = await run_blocking(aggregator.get_supplier_metrics, supplier_name)
         
-        return MetricsResponse(
+        return metrics_response(
             success=True,
             data=metrics,
             timestamp=get_timestamp()
@@ -44,15 +44,17 @@ async def get_supplier_kpis(supplier_name: str = "BIDCO", df: pl.DataFrame = Dep
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{supplier_name}/summary")
-async def get_executive_summary(supplier_name: str = "BIDCO", df: pl.DataFrame = Depends(get_df)):
+async def get_executive_summary(
+    supplier_name: str = "BIDCO",
+    aggregator: KPIAggregator = Depends(get_kpi_aggregator)
+):
     """
     Get executive summary for a supplier.
     """
     try:
-        aggregator = KPIAggregator(df)
-        summary = aggregator.generate_executive_summary(supplier_name)
+        summary = await run_blocking(aggregator.generate_executive_summary, supplier_name)
         
-        return MetricsResponse(
+        return metrics_response(
             success=True,
             data=summary,
             timestamp=get_timestamp()
@@ -2,25 +2,26 @@
 Pricing Endpoints
 """
 from fastapi import APIRouter, HTTPException, Depends
-import polars as pl
 
-from schema import MetricsResponse
 from analytics.pricing import PriceIndexCalculator
 from utils import get_timestamp
-from api.dependencies import get_df
+from api.responses import metrics_response
+from api.dependencies import get_price_calculator, run_blocking
 
 router = APIRouter(prefix="/api/pricing", tags=["pricing"])
 
 @router.get("/{supplier_name}")
-async def get_price_positioning(supplier_name: str = "BIDCO", df: pl.DataFrame = Depends(get_df)):
+async def get_price_positioning(
+    supplier_name: str = "BIDCO",
+    calculator: PriceIndexCalculator = Depends(get_price_calculator)
+):
     """
     Get price positioning for a supplier.
     """
     try:
-        calculator = PriceIndexCalculator(df)
-        summary = calculator.get_price_summary(supplier_name)
+        summary = await run_blocking(calculator.get_price_summary, supplier_name)
         
-        return MetricsResponse(
+        return metrics_response(
             success=True,
             data={
                 "supplier": summary.supplier,
@@ -29,7 +30,8 @@ async def get_price_positioning(supplier_name: str = "BIDCO", df: pl.DataFrame =
                     "total_skus": summary.total_skus,
                     "premium_skus": summary.premium_skus,
                     "at_market_skus": summary.at_market_skus,
-                    "discount_skus": summary.discount_skus
+                    "discount_skus": summary.discount_skus,
+                    "insufficient_data_skus": summary.insufficient_data_skus
                 },
                 "price_indices": {
                     "average": summary.avg_price_index,
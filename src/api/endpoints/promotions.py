@@ -2,26 +2,27 @@
 Promotions Endpoints for Bidco Retail Analysis API.
 """
 from fastapi import APIRouter, HTTPException, Depends
-import polars as pl
 
-from schema import MetricsResponse
 from analytics.promotions import PromoDetector
 from utils import get_timestamp
-from api.dependencies import get_df
+from api.responses import metrics_response
+from api.dependencies import get_promo_detector, run_blocking
 from schema import PromoPerformanceSummary
 
 router = APIRouter(prefix="/api/promos", tags=["promotions"])
 
 @router.get("/{supplier_name}")
-async def get_promo_performance(supplier_name: str = "BIDCO", df: pl.DataFrame = Depends(get_df)):
+async def get_promo_performance(
+    supplier_name: str = "BIDCO",
+    detector: PromoDetector = Depends(get_promo_detector)
+):
     """
     Get promotional performance for a supplier.
     """
     try:
-        detector = PromoDetector(df)
-        summary = detector.get_supplier_summary(supplier_name)
+        summary = await run_blocking(detector.get_supplier_summary, supplier_name)
         
-        return MetricsResponse(
+        return metrics_response(
             success=True,
             data={
                 "supplier": summary.supplier,
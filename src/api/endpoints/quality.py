@@ -1,63 +1,42 @@
 """
 Data Quality Endpoints
 """
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Header, Response
 from typing import Optional
-import polars as pl
 
-from schema import MetricsResponse
-from quality import generate_quality_report
 from utils import get_timestamp
-from api.dependencies import get_df
+from api.responses import metrics_response, stream_metrics_rows, etag_matches
+from api.dependencies import get_quality_views
+from api.quality_views import QualityViews
 
 router = APIRouter(prefix="/api/quality", tags=["quality"])
 
 @router.get("/report")
-async def get_quality_report(df: pl.DataFrame = Depends(get_df)):
+async def get_quality_report(
+    views: QualityViews = Depends(get_quality_views),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get complete data quality report.
+    
+    Clients revalidating with the report's ETag get an empty 304.
     """
+    cache_headers = {"ETag": views.report_etag, "Cache-Control": "public, max-age=60"}
+    if etag_matches(if_none_match, views.report_etag):
+        return Response(status_code=304, headers=cache_headers)
+    
     try:
-        report = generate_quality_report(df)
-        
-        return MetricsResponse(
+        response = metrics_response(
             success=True,
-            data={
-                "report_date": str(report.report_date),
-                "total_records": report.total_records,
-                "total_stores": report.total_stores,
-                "total_suppliers": report.total_suppliers,
-                "overall_metrics": {
-                    "completeness": report.overall_completeness,
-                    "validity": report.overall_validity,
-                    "consistency": report.overall_consistency
-                },
-                "store_summary": {
-                    "trusted": report.trusted_stores,
-                    "untrusted": report.untrusted_stores
-                },
-                "supplier_summary": {
-                    "trusted": report.trusted_suppliers,
-                    "untrusted": report.untrusted_suppliers
-                },
-                "critical_issues": [
-                    {
-                        "type": issue.issue_type,
-                        "severity": issue.severity,
-                        "field": issue.field_name,
-                        "description": issue.description,
-                        "count": issue.count,
-                        "percentage": issue.percentage
-                    }
-                    for issue in report.critical_issues
-                ]
-            },
+            data=views.report,
             metadata={
                 "endpoint": "/api/quality/report",
                 "data_source": "Test_Data.xlsx"
             },
             timestamp=get_timestamp()
         )
+        response.headers.update(cache_headers)
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -65,96 +44,51 @@ async def get_quality_report(df: pl.DataFrame = Depends(get_df)):
 async def get_store_scores(
     min_score: Optional[float] = Query(None, description="Minimum quality score filter"),
     trusted_only: bool = Query(False, description="Return only trusted stores"),
-    df: pl.DataFrame = Depends(get_df)
+    views: QualityViews = Depends(get_quality_views)
 ):
     """
     Get quality scores for all stores.
     """
     try:
-        report = generate_quality_report(df)
-        
-        stores = []
-        for score in report.store_scores:
-            if trusted_only and not score.is_trusted:
-                continue
-            if min_score is not None and score.overall_score < min_score:
-                continue
-                
-            stores.append({
-                "store_name": score.entity_name,
-                "overall_score": score.overall_score,
-                "grade": score.grade,
-                "is_trusted": score.is_trusted,
-                "completeness_score": score.completeness_score,
-                "validity_score": score.validity_score,
-                "consistency_score": score.consistency_score,
-                "total_records": score.total_records
-            })
-        
-        return MetricsResponse(
-            success=True,
-            data={
-                "stores": stores,
-                "count": len(stores)
-            },
+        # Rows are filtered while the response streams
+        return stream_metrics_rows(
+            "stores",
+            views.iter_stores(min_score, trusted_only),
             metadata={
                 "endpoint": "/api/quality/stores",
                 "filters": {
                     "min_score": min_score,
                     "trusted_only": trusted_only
                 }
-            },
-            timestamp=get_timestamp()
+            }
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/suppliers/{supplier_name}")
-async def get_supplier_score(supplier_name: str, df: pl.DataFrame = Depends(get_df)):
+async def get_supplier_score(
+    supplier_name: str,
+    views: QualityViews = Depends(get_quality_views)
+):
     """
     Get quality score for a specific supplier.
     """
     try:
-        report = generate_quality_report(df)
-        
         # Find supplier (case-insensitive)
-        supplier_scores = [
-            s for s in report.supplier_scores 
-            if supplier_name.lower() in s.entity_name.lower()
-        ]
+        supplier = views.find_supplier(supplier_name)
         
-        if not supplier_scores:
+        if supplier is None:
             raise HTTPException(
-                status_code=404, 
+                status_code=404,
                 detail=f"Supplier '{supplier_name}' not found"
             )
         
-        score = supplier_scores[0]
-        
-        return MetricsResponse(
+        return metrics_response(
             success=True,
-            data={
-                "supplier_name": score.entity_name,
-                "overall_score": score.overall_score,
-                "grade": score.grade,
-                "is_trusted": score.is_trusted,
-                "completeness_score": score.completeness_score,
-                "validity_score": score.validity_score,
-                "consistency_score": score.consistency_score,
-                "total_records": score.total_records,
-                "issues": [
-                    {
-                        "type": issue.issue_type,
-                        "severity": issue.severity,
-                        "field": issue.field_name,
-                        "description": issue.description
-                    }
-                    for issue in score.issues
-                ]
-            },
+            data=supplier,
             timestamp=get_timestamp()
         )
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -4,6 +4,7 @@ FastAPI Application - Bidco Retail Analysis
 REST API exposing data quality, promotions, pricing, and KPIs.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -14,11 +15,13 @@ if str(project_root / "src") not in sys.path:
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 from schema import ErrorResponse
 from utils.helpers import get_timestamp
 from api.dependencies import load_data
+from api.responses import ORJSONResponse
 
 # Import all routers
 from api.endpoints import health, quality, promotions, pricing, kpis, dashboard
@@ -33,18 +36,29 @@ app = FastAPI(
     description="REST API for retail data quality and performance analytics",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Add CORS middleware; set API_CORS_ORIGINS (comma-separated) in production
+# so origins are checked by set membership instead of allowing any
+cors_origins = [
+    origin.strip()
+    for origin in os.environ.get("API_CORS_ORIGINS", "*").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  #
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=cors_origins,
+    allow_credentials=False,  # No cookie or auth-header sessions
+    allow_methods=["GET"],  # Read-only API
+    allow_headers=["Accept", "Content-Type", "If-None-Match"],
 )
 
+# Compress larger JSON payloads (store listings, reports); added last so
+# it is the outermost layer and sees the final response body
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+
 # Register routers
 app.include_router(health.router)
 app.include_router(quality.router)
@@ -80,6 +94,7 @@ async def internal_error_handler(request, exc):
     )
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     
    
@@ -91,4 +106,21 @@ if __name__ == "__main__":
     print("Health check: http://localhost:8000/health")
     print()
     
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=False)
\ No newline at end of file
+    # Worker processes import the app by path; a single worker serves
+    # this already-loaded instance
+    workers = int(os.environ.get("API_WORKERS", "1"))
+    target = "api.main:app" if workers > 1 else app
+    
+    # uvicorn[standard] ships uvloop and httptools (uvloop is not built for Windows)
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "auto"
+    
+    uvicorn.run(
+        target,
+        host="0.0.0.0",
+        port=8000,
+        reload=False,
+        loop=loop,
+        http=http,
+        workers=workers
+    )
\ No newline at end of file
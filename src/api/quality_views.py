@@ -0,0 +1,135 @@
+"""
+Quality Views
+=============
+Data quality report pre-shaped into the quality route payloads.
+"""
+import hashlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from schema import DataQualityIssue, DataQualityReport, DataQualityScore
+
+
+def _issue_row(issue: DataQualityIssue, with_counts: bool = True) -> Dict[str, Any]:
+    """Issue as returned by the quality routes"""
+    row = {
+        "type": issue.issue_type,
+        "severity": issue.severity,
+        "field": issue.field_name,
+        "description": issue.description
+    }
+    if with_counts:
+        row["count"] = issue.count
+        row["percentage"] = issue.percentage
+    return row
+
+
+def _store_row(score: DataQualityScore) -> Dict[str, Any]:
+    """Store score row for the store listing"""
+    return {
+        "store_name": score.entity_name,
+        "overall_score": score.overall_score,
+        "grade": score.grade,
+        "is_trusted": score.is_trusted,
+        "completeness_score": score.completeness_score,
+        "validity_score": score.validity_score,
+        "consistency_score": score.consistency_score,
+        "total_records": score.total_records
+    }
+
+
+def _supplier_payload(score: DataQualityScore) -> Dict[str, Any]:
+    """Supplier score with its issues"""
+    return {
+        "supplier_name": score.entity_name,
+        "overall_score": score.overall_score,
+        "grade": score.grade,
+        "is_trusted": score.is_trusted,
+        "completeness_score": score.completeness_score,
+        "validity_score": score.validity_score,
+        "consistency_score": score.consistency_score,
+        "total_records": score.total_records,
+        "issues": [_issue_row(issue, with_counts=False) for issue in score.issues]
+    }
+
+
+class QualityViews:
+    """
+    Route payloads built once from a quality report.
+    
+    Handlers only filter or look up these ready-made dicts.
+    """
+    
+    def __init__(self, report: DataQualityReport):
+        """Shape the report into the report, store and supplier payloads."""
+        self.report: Dict[str, Any] = {
+            "report_date": str(report.report_date),
+            "total_records": report.total_records,
+            "total_stores": report.total_stores,
+            "total_suppliers": report.total_suppliers,
+            "overall_metrics": {
+                "completeness": report.overall_completeness,
+                "validity": report.overall_validity,
+                "consistency": report.overall_consistency
+            },
+            "store_summary": {
+                "trusted": report.trusted_stores,
+                "untrusted": report.untrusted_stores
+            },
+            "supplier_summary": {
+                "trusted": report.trusted_suppliers,
+                "untrusted": report.untrusted_suppliers
+            },
+            "critical_issues": [_issue_row(issue) for issue in report.critical_issues]
+        }
+        
+        # Weak validator for the report payload (the envelope timestamp
+        # varies per response, the content does not)
+        digest = hashlib.blake2b(orjson.dumps(self.report), digest_size=16).hexdigest()
+        self.report_etag = f'W/"{digest}"'
+        
+        self.stores: List[Dict[str, Any]] = [_store_row(score) for score in report.store_scores]
+        
+        # (lowercase name, payload) in report order for substring lookups
+        self.suppliers: List[Tuple[str, Dict[str, Any]]] = [
+            (score.entity_name.lower(), _supplier_payload(score))
+            for score in report.supplier_scores
+        ]
+        
+        # Exact-name index holding what the substring scan would return for
+        # that name (an earlier, longer name containing it wins)
+        self._supplier_index: Dict[str, Dict[str, Any]] = {}
+        for name, _ in self.suppliers:
+            if name not in self._supplier_index:
+                self._supplier_index[name] = self._scan_supplier(name)
+    
+    def iter_stores(
+        self,
+        min_score: Optional[float] = None,
+        trusted_only: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """Store rows passing the optional score and trust filters, lazily"""
+        return (
+            row for row in self.stores
+            if (not trusted_only or row["is_trusted"])
+            and (min_score is None or row["overall_score"] >= min_score)
+        )
+    
+    def find_supplier(self, supplier_name: str) -> Optional[Dict[str, Any]]:
+        """
+        First supplier in report order whose name contains `supplier_name`
+        (case-insensitive); exact names are answered from an index.
+        """
+        needle = supplier_name.lower()
+        payload = self._supplier_index.get(needle)
+        if payload is not None:
+            return payload
+        return self._scan_supplier(needle)
+    
+    def _scan_supplier(self, needle: str) -> Optional[Dict[str, Any]]:
+        """First supplier in report order whose lowercase name contains `needle`"""
+        for name, payload in self.suppliers:
+            if needle in name:
+                return payload
+        return None
@@ -0,0 +1,87 @@
+"""
+API Response Classes
+====================
+orjson-backed JSON response used as the application default.
+"""
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import orjson
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from schema import MetricsResponse
+from utils import get_timestamp
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder"""
+    
+    media_type = "application/json"
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+        )
+
+
+def metrics_response(**fields: Any) -> ORJSONResponse:
+    """
+    Build a MetricsResponse and render it directly.
+    
+    Returning a Response skips FastAPI's jsonable_encoder walk over the
+    payload. The validated envelope's fields go to orjson as-is (no
+    model_dump copy of the payload), so route data must already be
+    plain JSON types.
+    """
+    return ORJSONResponse(dict(MetricsResponse(**fields)))
+
+
+def stream_metrics_rows(
+    key: str,
+    rows: Iterable[Dict[str, Any]],
+    metadata: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 256
+) -> StreamingResponse:
+    """
+    Stream a MetricsResponse whose data is `{key: [rows], "count": n}`.
+    
+    Rows are encoded in chunks as they are consumed, so the first bytes
+    are sent before the whole list is built or encoded. The body matches
+    what `metrics_response` renders for the same data.
+    """
+    timestamp = get_timestamp()
+    
+    def body() -> Iterator[bytes]:
+        yield b'{"success":true,"data":{' + orjson.dumps(key) + b':['
+        count = 0
+        chunk = []
+        for row in rows:
+            chunk.append(orjson.dumps(row))
+            if len(chunk) == chunk_size:
+                yield (b"," if count else b"") + b",".join(chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            yield (b"," if count else b"") + b",".join(chunk)
+            count += len(chunk)
+        yield (
+            b'],"count":' + str(count).encode()
+            + b'},"metadata":' + orjson.dumps(metadata or {})
+            + b',"timestamp":' + orjson.dumps(timestamp) + b"}"
+        )
+    
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag` (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -4,16 +4,23 @@ Defines Pydantic models for structured configuration management.
 
 from pathlib import Path
 from typing import List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
-# Project paths
-PROJECT_ROOT = Path.cwd().parent
+# Project paths (from this file, so they don't depend on the launch directory)
+# src/config.py -> src -> project_root
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 RAW_DATA_DIR = DATA_DIR / "raw"
 
 
-class PromoConfig(BaseModel):
+class _FrozenConfig(BaseModel):
+    """Base for the module-level config singletons (read-only, no unknown keys)"""
+    
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+class PromoConfig(_FrozenConfig):
     """
     Configuration for promotion detection logic.
     """
@@ -46,10 +53,10 @@ class PromoConfig(BaseModel):
         default=50,
         description="Minimum promo units to be considered a top performer"
     )
-    
-  
 
-class DataQualityConfig(BaseModel):
+
+
+class DataQualityConfig(_FrozenConfig):
     """Configuration for data quality scoring"""
     
     # Completeness thresholds
@@ -92,7 +99,7 @@ class DataQualityConfig(BaseModel):
     consistency_weight: float = 0.30
 
 
-class PriceIndexConfig(BaseModel):
+class PriceIndexConfig(_FrozenConfig):
     """Configuration for competitive price indexing"""
     
     # Price index = Bidco Price / Competitor Avg Price
@@ -120,7 +127,7 @@ class PriceIndexConfig(BaseModel):
     )
 
 
-class AnalysisConfig(BaseModel):
+class AnalysisConfig(_FrozenConfig):
     """General analysis configuration"""
     
     # Target client
@@ -129,6 +136,16 @@ class AnalysisConfig(BaseModel):
         description="The supplier under analysis"
     )
     
+    # Columns read from the raw workbook (the RawTransactionRecord fields)
+    source_columns: List[str] = Field(
+        default=[
+            "Store Name", "Item_Code", "Item Barcode", "Description",
+            "Category", "Department", "Sub-Department", "Section",
+            "Quantity", "Total Sales", "RRP", "Supplier", "Date Of Sale"
+        ],
+        description="Workbook columns loaded for analysis"
+    )
+    
     # Competitive set definition
     competitive_grouping: List[str] = Field(
         default=["Sub-Department", "Section"],
@@ -141,6 +158,19 @@ class AnalysisConfig(BaseModel):
         description="Columns that define store-level groups"
     )
     
+    # Low-cardinality string columns used as group/filter keys
+    categorical_columns: List[str] = Field(
+        default=["Supplier", "Store Name", "Category", "Sub-Department", "Section", "Description"],
+        description="Columns cast to Categorical before aggregation"
+    )
+    
+    # Measures to store in single precision. Opt-in: Float32 does not hold
+    # most source prices exactly, so reported values would drift from the data
+    float32_columns: List[str] = Field(
+        default=[],
+        description="Measure columns stored as Float32 after preparation (e.g. Quantity, Total Sales, RRP, realized_unit_price)"
+    )
+    
     # Critical columns that must not be null
     required_columns: List[str] = Field(
         default=[
@@ -163,9 +193,16 @@ class AnalysisConfig(BaseModel):
         default=["RRP", "Item Barcode"],
         description="Columns to fill missing values"
     )
+    
+    # Bound on per-supplier results kept by each analytics cache
+    supplier_cache_size: int = Field(
+        default=64,
+        ge=1,
+        description="Supplier-keyed results cached per calculator (LRU)"
+    )
 
 
-class OutputConfig(BaseModel):
+class OutputConfig(_FrozenConfig):
     """Configuration for outputs and reporting"""
     
     # Number of top items to show in reports
@@ -214,12 +251,12 @@ def get_config_summary() -> dict:
 
 # if __name__ == "__main__":
 #     """Print configuration for validation"""
-    
+
 #     print("=" * 80)
 #     print("BIDCO RETAIL ANALYSIS - CONFIGURATION")
 #     print("=" * 80)
 #     print()
-    
+
 #     print("PROMO DETECTION (CROSS-SECTIONAL APPROACH)")
 #     print(f"  Discount threshold: {PROMO_CONFIG.discount_threshold_pct}%")
 #     print(f"  Min promo stores: {PROMO_CONFIG.min_promo_stores}")
@@ -227,7 +264,7 @@ def get_config_summary() -> dict:
 #     print(f"  Max realistic discount: {PROMO_CONFIG.max_realistic_discount_pct}%")
 #     print(f"  Min units for top performer: {PROMO_CONFIG.min_units_for_top_performer}")
 #     print()
-    
+
 #     print("DATA QUALITY")
 #     print(f"  Max null %: {QUALITY_CONFIG.max_acceptable_null_pct}%")
 #     print(f"  Max negative %: {QUALITY_CONFIG.max_acceptable_negative_pct}%")
@@ -238,20 +275,20 @@ def get_config_summary() -> dict:
 #           f"{QUALITY_CONFIG.validity_weight:.0%} validity, "
 #           f"{QUALITY_CONFIG.consistency_weight:.0%} consistency")
 #     print()
-    
+
 #     print("PRICE INDEX")
 #     print(f"  Premium threshold: {PRICE_INDEX_CONFIG.premium_threshold}x")
 #     print(f"  Discount threshold: {PRICE_INDEX_CONFIG.discount_threshold}x")
 #     print(f"  Min competitors: {PRICE_INDEX_CONFIG.min_competitors_for_index}")
 #     print(f"  Min transactions: {PRICE_INDEX_CONFIG.min_transactions_for_price}")
 #     print()
-    
+
 #     print("ANALYSIS")
 #     print(f"  Target supplier: {ANALYSIS_CONFIG.target_supplier}")
 #     print(f"  Competitive grouping: {', '.join(ANALYSIS_CONFIG.competitive_grouping)}")
 #     print(f"  Required columns: {len(ANALYSIS_CONFIG.required_columns)} fields")
 #     print()
-    
+
 #     print("=" * 80)
 #     print("Configuration valid and loaded")
 #     print("=" * 80)
\ No newline at end of file
@@ -1,13 +1,30 @@
 """
 Data Quality package for Bidco Retail Analysis
+
+Exports are loaded on first access (PEP 562), so importing the scoring
+helpers does not pull in Great Expectations.
 """
 
-from .health_score import DataQualityAnalyzer, generate_quality_report
-from .expectations import RetailDataExpectations, create_simple_expectations_suite
+from importlib import import_module
+
+# Public name -> defining submodule
+_EXPORTS = {
+    "DataQualityAnalyzer": ".health_score",
+    "generate_quality_report": ".health_score",
+    "RetailDataExpectations": ".expectations",
+    "create_simple_expectations_suite": ".expectations",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
 
-__all__ = [
-    "DataQualityAnalyzer",
-    "generate_quality_report",
-    "RetailDataExpectations",
-    "create_simple_expectations_suite",
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -9,289 +9,777 @@ from pathlib import Path
 
 # Add src to path for imports
 if __name__ == "__main__":
-    project_root = Path(__file__).parent.parent.parent
-    sys.path.insert(0, str(project_root / "src"))
+    src_dir = str(Path(__file__).parent.parent.parent / "src")
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
 
 import polars as pl
-import great_expectations as gx
-from great_expectations.core.batch import RuntimeBatchRequest
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from config import QUALITY_CONFIG, ANALYSIS_CONFIG
+from config import ANALYSIS_CONFIG
+from utils import LRUCache
 
 
-class RetailDataExpectations:
-    """
-    Great Expectations suite for retail transaction data.
+# GE type names used in the suite -> Polars dtypes
+_GE_DTYPES = {
+    "float64": pl.Float64,
+    "int64": pl.Int64
+}
+
+
+# Columns GE type-checks by NumPy dtype name; everything else stays Arrow-backed
+_GE_NUMPY_DTYPES = {
+    "Quantity": "float64",
+    "Total Sales": "float64",
+    "RRP": "float64"
+}
+
+
+def _to_ge_pandas(df: pl.DataFrame) -> Any:
     """
+    Pandas view of `df` for Great Expectations.
     
-    def __init__(self):
-        self.context = gx.get_context()
+    Arrow-backed columns keep strings as Arrow buffers instead of one
+    Python object per value; only the type-checked floats become NumPy.
+    """
+    df_pandas = df.to_pandas(use_pyarrow_extension_array=True)
+    numpy_dtypes = {
+        col: dtype for col, dtype in _GE_NUMPY_DTYPES.items()
+        if col in df_pandas.columns
+    }
+    return df_pandas.astype(numpy_dtypes)
+
+
+# Input schema -> (suite, plan, expressions) built by `_metric_plan`,
+# bounded so callers with many distinct schemas do not grow it forever
+_METRIC_PLANS = LRUCache(maxsize=16)
+
+
+def _relation_key(column_list: Sequence[str]) -> str:
+    """Metrics key for a multicolumn row relation"""
+    return "|".join(column_list)
+
+
+def _metric_plan(
+    expectations: Sequence[Mapping[str, Any]],
+    schema: pl.Schema
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Tuple[float, float]], List[pl.Expr]]:
+    """
+    Metrics each column needs, the ratio bounds of each row relation,
+    and the aggregate expressions computing them.
+    """
+    # At most one range check per column
+    plan: Dict[str, Dict[str, Any]] = {}
+    relations: Dict[str, Tuple[float, float]] = {}
+    for exp in expectations:
+        kind = exp["expectation_type"]
+        kwargs = exp["kwargs"]
+        if kind == "expect_multicolumn_row_relation":
+            if all(col in schema for col in kwargs["column_list"]):
+                key = _relation_key(kwargs["column_list"])
+                relations[key] = (kwargs["min_ratio"], kwargs["max_ratio"])
+            continue
         
-    def create_expectation_suite(self, suite_name: str = "retail_transactions") -> Dict[str, Any]:
-        """
-        Create  expectation suite for retail data.
+        col = kwargs.get("column")
+        if col not in schema:
+            continue
         
-       
-        """
-        suite = self.context.add_or_update_expectation_suite(expectation_suite_name=suite_name)
+        needs = plan.setdefault(col, {})
+        if kind == "expect_column_values_to_be_between":
+            needs["range"] = (kwargs["min_value"], kwargs["max_value"])
+        elif kind == "expect_column_distinct_values_to_be_in_set":
+            needs["distinct"] = True
+        elif kind == "expect_column_values_to_be_valid_dates":
+            # Temporal columns are parsed already; only strings need the check
+            needs["dates"] = schema[col] == pl.String
+    
+    exprs = [pl.len().alias("row_count")]
+    for col, needs in plan.items():
+        column = pl.col(col)
+        exprs.append(column.null_count().alias(f"nc_{col}"))
+        if "range" in needs:
+            low, high = needs["range"]
+            exprs += [
+                column.min().alias(f"min_{col}"),
+                column.max().alias(f"max_{col}"),
+                # Mean of the mask skips nulls, like GE's `mostly`
+                column.is_between(low, high).mean().alias(f"ir_{col}")
+            ]
+        if needs.get("distinct"):
+            exprs.append(column.drop_nulls().unique().implode().alias(f"dv_{col}"))
+        if needs.get("dates"):
+            # Vectorized parse; the null-masked mean covers present values only
+            parsed = column.str.to_datetime(strict=False).is_not_null()
+            exprs.append(
+                pl.when(column.is_not_null()).then(parsed).mean().alias(f"pf_{col}")
+            )
+    
+    for key, (low, high) in relations.items():
+        # Last column over the product of the others, all in one kernel;
+        # rows with a null operand drop out of the mean
+        *factors, total = key.split("|")
+        expected = pl.col(factors[0])
+        for factor in factors[1:]:
+            expected = expected * pl.col(factor)
+        ratio = pl.col(total) / expected
+        exprs += [
+            ratio.is_not_null().sum().alias(f"rp_{key}"),
+            ratio.is_between(low, high).mean().alias(f"rr_{key}")
+        ]
+    
+    return plan, relations, exprs
+
+
+def _single_pass_metrics(
+    df: pl.DataFrame,
+    expectations: Sequence[Mapping[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Column metrics backing the column-level expectations, in one pass.
+    
+    Returns the row count and, per column present in `df`, its
+    null_count plus whichever of min/max/in_range_frac (range checks),
+    distinct_set (set checks) and parsed_frac (date checks) the
+    expectations need.
+    """
+    # Same suite and schema (e.g. successive slices): reuse the expressions
+    schema_key = tuple(df.schema.items())
+    cached = _METRIC_PLANS.get(schema_key)
+    if cached is None or cached[0] is not expectations:
+        cached = (expectations, *_metric_plan(expectations, df.schema))
+        _METRIC_PLANS.put(schema_key, cached)
+    _, plan, relations, exprs = cached
+    
+    row = df.lazy().select(exprs).collect(engine="streaming").row(0, named=True)
+    
+    columns: Dict[str, Dict[str, Any]] = {}
+    for col, needs in plan.items():
+        metrics = columns[col] = {"null_count": row[f"nc_{col}"]}
+        if "range" in needs:
+            metrics["min"] = row[f"min_{col}"]
+            metrics["max"] = row[f"max_{col}"]
+            metrics["in_range_frac"] = row[f"ir_{col}"]
+        if needs.get("distinct"):
+            metrics["distinct_set"] = frozenset(row[f"dv_{col}"])
+        if "dates" in needs:
+            if needs["dates"]:
+                metrics["parsed_frac"] = row[f"pf_{col}"]
+            else:
+                present = row["row_count"] > row[f"nc_{col}"]
+                metrics["parsed_frac"] = 1.0 if present else None
+    
+    relation_metrics = {
+        key: {"present": row[f"rp_{key}"], "in_range_frac": row[f"rr_{key}"]}
+        for key in relations
+    }
+    
+    return {"row_count": row["row_count"], "columns": columns, "relations": relation_metrics}
+
+
+def _merge_metrics(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine `_single_pass_metrics` results of row slices.
+    
+    Counts and distinct sets add up, min/max fold, and fractions are
+    recombined from their per-slice counts of present values.
+    """
+    row_count = sum(part["row_count"] for part in parts)
+    columns: Dict[str, Dict[str, Any]] = {}
+    
+    for col, first in parts[0]["columns"].items():
+        slices = [(part["row_count"], part["columns"][col]) for part in parts]
+        merged = columns[col] = {
+            "null_count": sum(metrics["null_count"] for _, metrics in slices)
+        }
+        present = row_count - merged["null_count"]
         
-        # Build expectations
-        expectations = self._build_expectations()
+        for key, fold in (("min", min), ("max", max)):
+            if key in first:
+                values = [metrics[key] for _, metrics in slices if metrics[key] is not None]
+                merged[key] = fold(values) if values else None
         
-        return {
-            "suite_name": suite_name,
-            "expectations_count": len(expectations),
-            "expectations": expectations
+        for key in ("in_range_frac", "parsed_frac"):
+            if key in first:
+                # Fractions are over present values; round back to counts
+                hits = sum(
+                    round(metrics[key] * (rows - metrics["null_count"]))
+                    for rows, metrics in slices
+                    if metrics[key] is not None
+                )
+                merged[key] = hits / present if present else None
+        
+        if "distinct_set" in first:
+            merged["distinct_set"] = frozenset().union(
+                *(metrics["distinct_set"] for _, metrics in slices)
+            )
+    
+    relations: Dict[str, Dict[str, Any]] = {}
+    for key in parts[0]["relations"]:
+        slices = [part["relations"][key] for part in parts]
+        present = sum(metrics["present"] for metrics in slices)
+        hits = sum(
+            round(metrics["in_range_frac"] * metrics["present"])
+            for metrics in slices
+            if metrics["in_range_frac"] is not None
+        )
+        relations[key] = {
+            "present": present,
+            "in_range_frac": hits / present if present else None
         }
     
-    def _build_expectations(self) -> List[Dict[str, Any]]:
-        """Build all data quality expectations"""
-        expectations = []
-        
-        # ================================================================
-        # SCHEMA EXPECTATIONS (columns must exist)
-        # ================================================================
-        expectations.append({
-            "expectation_type": "expect_table_columns_to_match_set",
-            "kwargs": {
-                "column_set": [
-                    "Store Name", "Item_Code", "Item Barcode", "Description",
-                    "Category", "Department", "Sub-Department", "Section",
-                    "Quantity", "Total Sales", "RRP", "Supplier", "Date Of Sale"
-                ],
-                "exact_match": True
-            },
-            "meta": {
-                "description": "All required columns must be present"
+    return {"row_count": row_count, "columns": columns, "relations": relations}
+
+
+def _native_result(
+    exp: Mapping[str, Any],
+    metrics: Dict[str, Any],
+    schema: pl.Schema,
+    runtime_sets: Optional[Mapping[str, FrozenSet[str]]] = None
+) -> Dict[str, Any]:
+    """
+    GE-shaped result for one expectation from the pass metrics.
+    
+    `runtime_sets` supplies value sets left open (None) in the suite.
+    """
+    kind = exp["expectation_type"]
+    kwargs = exp["kwargs"]
+    col = kwargs.get("column")
+    n = metrics["row_count"]
+    result: Dict[str, Any] = {}
+    
+    needed = kwargs.get("column_list", [col] if col is not None else [])
+    missing = [name for name in needed if name not in schema]
+    if missing:
+        return {
+            "expectation_config": exp,
+            "success": False,
+            "result": result,
+            "exception_info": {
+                "raised_exception": True,
+                "exception_message": f"Column '{missing[0]}' not found"
             }
-        })
-        
-        # ================================================================
-        # COMPLETENESS EXPECTATIONS (no nulls in critical fields)
-        # ================================================================
-        for col in ANALYSIS_CONFIG.required_columns:
-            expectations.append({
-                "expectation_type": "expect_column_values_to_not_be_null",
-                "kwargs": {
-                    "column": col
-                },
-                "meta": {
-                    "description": f"{col} must not have null values"
-                }
-            })
-        
-        # Allow some nulls in RRP and Item Barcode (imputable)
+        }
+    column = metrics["columns"].get(col, {})
+    
+    if kind == "expect_table_columns_to_match_set":
+        expected = kwargs["column_set"]
+        if kwargs.get("exact_match"):
+            success = set(schema) == set(expected)
+        else:
+            success = set(expected).issubset(schema)
+        result["observed_value"] = list(schema)
+    
+    elif kind == "expect_table_row_count_to_be_between":
+        success = kwargs["min_value"] <= n <= kwargs["max_value"]
+        result["observed_value"] = n
+    
+    elif kind == "expect_column_values_to_not_be_null":
+        nulls = column["null_count"]
+        success = n - nulls >= kwargs.get("mostly", 1.0) * n
+        result["element_count"] = n
+        result["unexpected_count"] = nulls
+        result["unexpected_percent"] = nulls / n * 100 if n else 0.0
+    
+    elif kind == "expect_column_values_to_be_between":
+        in_range = column["in_range_frac"]
+        # All-null column: nothing to check
+        success = in_range is None or in_range >= kwargs.get("mostly", 1.0)
+        result["element_count"] = n
+        result["missing_count"] = column["null_count"]
+        result["unexpected_percent"] = (1 - in_range) * 100 if in_range is not None else 0.0
+        result["observed_min"] = column["min"]
+        result["observed_max"] = column["max"]
+    
+    elif kind == "expect_column_values_to_be_of_type":
+        dtype = schema[col]
+        success = dtype == _GE_DTYPES[kwargs["type_"]]
+        result["observed_value"] = str(dtype)
+    
+    elif kind == "expect_column_distinct_values_to_be_in_set":
+        distinct = column["distinct_set"]
+        value_set = kwargs["value_set"]
+        if value_set is None and runtime_sets:
+            value_set = runtime_sets.get(col)
+        result["observed_value"] = sorted(distinct)
+        if value_set is None:
+            success = True
+        else:
+            unexpected = distinct.difference(value_set)
+            success = not unexpected
+            result["unexpected_values"] = sorted(unexpected)
+    
+    elif kind == "expect_column_values_to_be_valid_dates":
+        parsed = column["parsed_frac"]
+        success = parsed is None or parsed >= kwargs.get("mostly", 1.0)
+        result["element_count"] = n
+        result["unexpected_percent"] = (1 - parsed) * 100 if parsed is not None else 0.0
+    
+    elif kind == "expect_multicolumn_row_relation":
+        relation = metrics["relations"][_relation_key(kwargs["column_list"])]
+        in_range = relation["in_range_frac"]
+        success = in_range is None or in_range >= kwargs.get("mostly", 1.0)
+        result["element_count"] = n
+        result["missing_count"] = n - relation["present"]
+        result["unexpected_percent"] = (1 - in_range) * 100 if in_range is not None else 0.0
+    
+    else:
+        raise ValueError(f"No native check for {kind}")
+    
+    return {"expectation_config": exp, "success": bool(success), "result": result}
+
+
+def _ge_summary(validation_result: Any) -> Dict[str, Any]:
+    """Summary dict for one GE validation result"""
+    statistics = validation_result.statistics
+    return {
+        "success": validation_result.success,
+        "statistics": statistics,
+        "results": validation_result.results,
+        "evaluated_expectations": statistics.get("evaluated_expectations", 0),
+        "successful_expectations": statistics.get("successful_expectations", 0),
+        "unsuccessful_expectations": statistics.get("unsuccessful_expectations", 0),
+        "success_percent": statistics.get("success_percent", 0.0)
+    }
+
+
+# Fixed for the process lifetime; captured once for the suite below
+_REQUIRED_COLUMNS = tuple(ANALYSIS_CONFIG.required_columns)
+
+# Known product categories
+_ALLOWED_CATEGORIES = frozenset({"FOODS", "HOMECARE", "PERSONAL CARE"})
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of nested dicts/lists (mapping proxies and tuples)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain dict/list copy of a value made by `_freeze`"""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _compute_expectations() -> Tuple[Mapping[str, Any], ...]:
+    """Build all data quality expectations (read-only)"""
+    expectations = []
+    
+    # ================================================================
+    # SCHEMA EXPECTATIONS (columns must exist)
+    # ================================================================
+    expectations.append({
+        "expectation_type": "expect_table_columns_to_match_set",
+        "kwargs": {
+            "column_set": [
+                "Store Name", "Item_Code", "Item Barcode", "Description",
+                "Category", "Department", "Sub-Department", "Section",
+                "Quantity", "Total Sales", "RRP", "Supplier", "Date Of Sale"
+            ],
+            "exact_match": True
+        },
+        "meta": {
+            "description": "All required columns must be present"
+        }
+    })
+    
+    # ================================================================
+    # COMPLETENESS EXPECTATIONS (no nulls in critical fields)
+    # ================================================================
+    for col in _REQUIRED_COLUMNS:
         expectations.append({
             "expectation_type": "expect_column_values_to_not_be_null",
             "kwargs": {
-                "column": "RRP",
-                "mostly": 0.95  # Allow up to 5% nulls
+                "column": col
             },
             "meta": {
-                "description": "RRP should be present in at least 95% of records"
-            }
-        })
-        
-        # ================================================================
-        # VALIDITY EXPECTATIONS (correct data types and ranges)
-        # ================================================================
-        
-        # Quantity should be numeric and mostly positive
-        expectations.append({
-            "expectation_type": "expect_column_values_to_be_of_type",
-            "kwargs": {
-                "column": "Quantity",
-                "type_": "float64"
-            }
-        })
-        
-        expectations.append({
-            "expectation_type": "expect_column_values_to_be_between",
-            "kwargs": {
-                "column": "Quantity",
-                "min_value": 0,
-                "max_value": 10000,
-                "mostly": 0.99  # Allow 1% outside range (returns)
-            },
-            "meta": {
-                "description": "Quantity should be between 0 and 10,000 for 99% of records"
+                "description": f"{col} must not have null values"
             }
         })
+    
+    # Allow some nulls in RRP and Item Barcode (imputable)
+    expectations.append({
+        "expectation_type": "expect_column_values_to_not_be_null",
+        "kwargs": {
+            "column": "RRP",
+            "mostly": 0.95  # Allow up to 5% nulls
+        },
+        "meta": {
+            "description": "RRP should be present in at least 95% of records"
+        }
+    })
+    
+    # ================================================================
+    # VALIDITY EXPECTATIONS (correct data types and ranges)
+    # ================================================================
+    
+    # Quantity should be numeric and mostly positive
+    expectations.append({
+        "expectation_type": "expect_column_values_to_be_of_type",
+        "kwargs": {
+            "column": "Quantity",
+            "type_": "float64"
+        }
+    })
+    
+    expectations.append({
+        "expectation_type": "expect_column_values_to_be_between",
+        "kwargs": {
+            "column": "Quantity",
+            "min_value": 0,
+            "max_value": 10000,
+            "mostly": 0.99  # Allow 1% outside range (returns)
+        },
+        "meta": {
+            "description": "Quantity should be between 0 and 10,000 for 99% of records"
+        }
+    })
+    
+    # Total Sales should be numeric and mostly positive
+    expectations.append({
+        "expectation_type": "expect_column_values_to_be_of_type",
+        "kwargs": {
+            "column": "Total Sales",
+            "type_": "float64"
+        }
+    })
+    
+    expectations.append({
+        "expectation_type": "expect_column_values_to_be_between",
+        "kwargs": {
+            "column": "Total Sales",
+            "min_value": 0,
+            "max_value": 100000,
+            "mostly": 0.99
+        },
+        "meta": {
+            "description": "Total Sales should be positive for 99% of records"
+        }
+    })
+    
+    # RRP should be positive when present
+    expectations.append({
+        "expectation_type": "expect_column_values_to_be_between",
+        "kwargs": {
+            "column": "RRP",
+            "min_value": 0,
+            "max_value": 50000,
+            "mostly": 0.95
+        },
+        "meta": {
+            "description": "RRP should be reasonable (0-50,000)"
+        }
+    })
+    
+    # Item_Code should be positive integer
+    expectations.append({
+        "expectation_type": "expect_column_values_to_be_between",
+        "kwargs": {
+            "column": "Item_Code",
+            "min_value": 100000,
+            "max_value": 999999
+        },
+        "meta": {
+            "description": "Item codes should be 6-digit numbers"
+        }
+    })
+    
+    # ================================================================
+    # CONSISTENCY EXPECTATIONS (logical relationships)
+    # ================================================================
+    
+    # Store names should be from a known set (if we have the list)
+    expectations.append({
+        "expectation_type": "expect_column_distinct_values_to_be_in_set",
+        "kwargs": {
+            "column": "Store Name",
+            "value_set": None,  # Will be populated at runtime
+            "result_format": "SUMMARY"
+        },
+        "meta": {
+            "description": "Store names should be from known retail outlets"
+        }
+    })
+    
+    # Category should be one of the known categories
+    expectations.append({
+        "expectation_type": "expect_column_distinct_values_to_be_in_set",
+        "kwargs": {
+            "column": "Category",
+            "value_set": sorted(_ALLOWED_CATEGORIES)  # Stable order for the suite
+        },
+        "meta": {
+            "description": "Category must be FOODS, HOMECARE, or PERSONAL CARE"
+        }
+    })
+    
+    # Date should parse (checked natively with a vectorized Polars cast
+    # instead of GE's per-row dateutil parse)
+    expectations.append({
+        "expectation_type": "expect_column_values_to_be_valid_dates",
+        "kwargs": {
+            "column": "Date Of Sale",
+            "mostly": 0.99
+        },
+        "meta": {
+            "description": "Date Of Sale must be a valid date for 99% of records"
+        }
+    })
+    
+    # Sales should agree with quantity x RRP: one fused row-wise check
+    # over the three columns (promotions and rounding stay well inside)
+    expectations.append({
+        "expectation_type": "expect_multicolumn_row_relation",
+        "kwargs": {
+            "column_list": ["Quantity", "RRP", "Total Sales"],
+            "min_ratio": 0.5,
+            "max_ratio": 2.0,
+            "mostly": 0.99
+        },
+        "meta": {
+            "description": "Total Sales should be 0.5-2x Quantity x RRP for 99% of records"
+        }
+    })
+    
+    # ================================================================
+    # UNIQUENESS EXPECTATIONS
+    # ================================================================
+    
+    # No exact duplicate rows
+    expectations.append({
+        "expectation_type": "expect_table_row_count_to_be_between",
+        "kwargs": {
+            "min_value": 1000,
+            "max_value": 100000
+        },
+        "meta": {
+            "description": "Table should have reasonable number of rows"
+        }
+    })
+    
+    return tuple(_freeze(exp) for exp in expectations)
+
+
+# Built once at import: the suite depends only on module-level config
+_STATIC_EXPECTATIONS = _compute_expectations()
+
+
+class RetailDataExpectations:
+    """
+    Great Expectations suite for retail transaction data.
+    """
+    
+    def __init__(self, known_stores: Optional[Iterable[str]] = None):
+        """
+        Store the known store names; GE is only set up on first use.
         
-        # Total Sales should be numeric and mostly positive
-        expectations.append({
-            "expectation_type": "expect_column_values_to_be_of_type",
-            "kwargs": {
-                "column": "Total Sales",
-                "type_": "float64"
-            }
-        })
+        `known_stores` fills the store-name value set, which the suite
+        leaves open.
+        """
+        self.known_stores = frozenset(known_stores) if known_stores is not None else None
+        self.context = None
+        self._known_suites = set()
+        self._checkpoint = None
+    
+    def _ensure_ge(self):
+        """
+        Set up the GE context, default suite and checkpoint once.
         
-        expectations.append({
-            "expectation_type": "expect_column_values_to_be_between",
-            "kwargs": {
-                "column": "Total Sales",
-                "min_value": 0,
-                "max_value": 100000,
-                "mostly": 0.99
-            },
-            "meta": {
-                "description": "Total Sales should be positive for 99% of records"
-            }
-        })
+        Deferred so native validation works without GE installed.
+        """
+        if self._checkpoint is not None:
+            return
         
-        # RRP should be positive when present
-        expectations.append({
-            "expectation_type": "expect_column_values_to_be_between",
-            "kwargs": {
-                "column": "RRP",
-                "min_value": 0,
-                "max_value": 50000,
-                "mostly": 0.95
-            },
-            "meta": {
-                "description": "RRP should be reasonable (0-50,000)"
-            }
-        })
+        # Built in locals and published together, so a failure part way
+        # leaves the instance unset and the next GE call retries
+        import great_expectations as gx
+        context = gx.get_context()
         
-        # Item_Code should be positive integer
-        expectations.append({
-            "expectation_type": "expect_column_values_to_be_between",
-            "kwargs": {
-                "column": "Item_Code",
-                "min_value": 100000,
-                "max_value": 999999
-            },
-            "meta": {
-                "description": "Item codes should be 6-digit numbers"
-            }
-        })
+        # Suites already in the context, so lookups need no try/except
+        known_suites = set(context.list_expectation_suite_names())
         
-        # ================================================================
-        # CONSISTENCY EXPECTATIONS (logical relationships)
-        # ================================================================
+        # Default suite and the checkpoint are registered once and reused
+        context.add_or_update_expectation_suite(expectation_suite_name="retail_transactions")
+        known_suites.add("retail_transactions")
+        checkpoint = context.add_or_update_checkpoint(
+            name="retail_checkpoint",
+            config_version=1.0,
+            class_name="SimpleCheckpoint",
+            run_name_template="%Y%m%d-%H%M%S"
+        )
         
-        # Store names should be from a known set (if we have the list)
-        expectations.append({
-            "expectation_type": "expect_column_distinct_values_to_be_in_set",
-            "kwargs": {
-                "column": "Store Name",
-                "value_set": None,  # Will be populated at runtime
-                "result_format": "SUMMARY"
-            },
-            "meta": {
-                "description": "Store names should be from known retail outlets"
-            }
-        })
+        self.context = context
+        self._known_suites = known_suites
+        self._checkpoint = checkpoint
+    
+    def create_expectation_suite(self, suite_name: str = "retail_transactions") -> Dict[str, Any]:
+        """
+        Create  expectation suite for retail data.
         
-        # Category should be one of the known categories
-        expectations.append({
-            "expectation_type": "expect_column_distinct_values_to_be_in_set",
-            "kwargs": {
-                "column": "Category",
-                "value_set": ["FOODS", "HOMECARE", "PERSONAL CARE"]
-            },
-            "meta": {
-                "description": "Category must be FOODS, HOMECARE, or PERSONAL CARE"
-            }
-        })
         
-        # Date should be within reasonable range
-        expectations.append({
-            "expectation_type": "expect_column_values_to_be_dateutil_parseable",
-            "kwargs": {
-                "column": "Date Of Sale"
-            },
-            "meta": {
-                "description": "Date Of Sale must be a valid date"
-            }
-        })
+        """
+        self._ensure_ge()
+        suite = self.context.add_or_update_expectation_suite(expectation_suite_name=suite_name)
+        self._known_suites.add(suite_name)
         
-        # ================================================================
-        # UNIQUENESS EXPECTATIONS
-        # ================================================================
+        # Build expectations
+        expectations = self._build_expectations(mutable=True)
         
-        # No exact duplicate rows
-        expectations.append({
-            "expectation_type": "expect_table_row_count_to_be_between",
-            "kwargs": {
-                "min_value": 1000,
-                "max_value": 100000
-            },
-            "meta": {
-                "description": "Table should have reasonable number of rows"
-            }
-        })
+        return {
+            "suite_name": suite_name,
+            "expectations_count": len(expectations),
+            "expectations": expectations
+        }
+    
+    def _build_expectations(self, mutable: bool = False) -> Sequence[Mapping[str, Any]]:
+        """
+        Data quality expectations.
         
-        return expectations
+        Returns the shared read-only tuple, or plain dict copies with
+        `mutable=True` for callers that edit them.
+        """
+        if mutable:
+            return _thaw(_STATIC_EXPECTATIONS)
+        return _STATIC_EXPECTATIONS
     
     def validate_data(
         self,
         df: pl.DataFrame,
-        suite_name: str = "retail_transactions"
+        suite_name: str = "retail_transactions",
+        use_ge: bool = False
     ) -> Dict[str, Any]:
         """
         Validate a dataframe against the expectation suite.
+        
+        Checks run natively on the Polars frame; `use_ge=True` goes
+        through Great Expectations instead (e.g. to build data docs).
         """
-        # Convert Polars to Pandas for Great Expectations
-        df_pandas = df.to_pandas()
+        return self.validate_many([df], suite_name, use_ge)[0]
+    
+    def validate_many(
+        self,
+        dfs: List[pl.DataFrame],
+        suite_name: str = "retail_transactions",
+        use_ge: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate several dataframes, one summary per frame (in order).
         
-        # Create a batch request
-        batch_request = RuntimeBatchRequest(
-            datasource_name="runtime_datasource",
-            data_connector_name="runtime_data_connector",
-            data_asset_name="retail_transactions",
-            runtime_parameters={"batch_data": df_pandas},
-            batch_identifiers={"default_identifier_name": "retail_data"}
-        )
+        On the GE path all frames go through a single checkpoint run.
+        """
+        if not use_ge:
+            return [self._validate_native(df) for df in dfs]
         
-        # Get or create expectation suite
-        try:
-            suite = self.context.get_expectation_suite(suite_name)
-        except:
-            self.create_expectation_suite(suite_name)
-            suite = self.context.get_expectation_suite(suite_name)
+        self._ensure_ge()
+        from great_expectations.core.batch import RuntimeBatchRequest
         
-        # Create checkpoint and run validation
-        checkpoint_config = {
-            "name": "retail_checkpoint",
-            "config_version": 1.0,
-            "class_name": "SimpleCheckpoint",
-            "run_name_template": "%Y%m%d-%H%M%S",
-        }
+        # Convert Polars to Pandas for Great Expectations
+        batch_requests = [
+            RuntimeBatchRequest(
+                datasource_name="runtime_datasource",
+                data_connector_name="runtime_data_connector",
+                data_asset_name="retail_transactions",
+                runtime_parameters={"batch_data": _to_ge_pandas(df)},
+                batch_identifiers={"default_identifier_name": f"retail_data_{i}"}
+            )
+            for i, df in enumerate(dfs)
+        ]
+        
+        # Create the expectation suite on first use
+        if suite_name not in self._known_suites:
+            self.create_expectation_suite(suite_name)
         
         try:
-            checkpoint = self.context.add_or_update_checkpoint(**checkpoint_config)
-            
-            results = checkpoint.run(
+            results = self._checkpoint.run(
                 validations=[
                     {
                         "batch_request": batch_request,
                         "expectation_suite_name": suite_name,
                     }
+                    for batch_request in batch_requests
                 ]
             )
             
-            # Extract useful summary
-            validation_result = results.list_validation_results()[0]
-            
-            return {
-                "success": validation_result.success,
-                "statistics": validation_result.statistics,
-                "results": validation_result.results,
-                "evaluated_expectations": validation_result.statistics.get("evaluated_expectations", 0),
-                "successful_expectations": validation_result.statistics.get("successful_expectations", 0),
-                "unsuccessful_expectations": validation_result.statistics.get("unsuccessful_expectations", 0),
-                "success_percent": validation_result.statistics.get("success_percent", 0.0)
-            }
-            
+            # Extract useful summaries
+            return [_ge_summary(result) for result in results.list_validation_results()]
+        
         except Exception as e:
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Validation failed with error"
-            }
+            return [
+                {
+                    "success": False,
+                    "error": str(e),
+                    "message": "Validation failed with error"
+                }
+                for _ in dfs
+            ]
+    
+    def validate_streaming(
+        self,
+        df: pl.DataFrame,
+        chunk_rows: int = 200_000
+    ) -> Dict[str, Any]:
+        """
+        Validate a large frame natively in row slices of `chunk_rows`.
+        
+        Per-slice metrics are merged, so the result matches a single
+        pass while each aggregation only touches one slice.
+        """
+        expectations = self._build_expectations()
+        parts = [
+            _single_pass_metrics(chunk, expectations)
+            for chunk in df.iter_slices(n_rows=chunk_rows)
+        ]
+        if not parts:
+            parts = [_single_pass_metrics(df, expectations)]
+        return self._summarize(expectations, _merge_metrics(parts), df.schema)
+    
+    def _validate_native(self, df: pl.DataFrame) -> Dict[str, Any]:
+        """
+        Evaluate the suite from one Polars aggregation pass.
+        
+        Returns the same summary as the GE path, with plain dicts as results.
+        """
+        expectations = self._build_expectations()
+        return self._summarize(expectations, _single_pass_metrics(df, expectations), df.schema)
+    
+    def _summarize(
+        self,
+        expectations: Sequence[Mapping[str, Any]],
+        metrics: Dict[str, Any],
+        schema: pl.Schema
+    ) -> Dict[str, Any]:
+        """Validation summary from the collected metrics"""
+        runtime_sets = {"Store Name": self.known_stores} if self.known_stores is not None else None
+        results = [
+            _native_result(exp, metrics, schema, runtime_sets)
+            for exp in expectations
+        ]
+        
+        evaluated = len(results)
+        successful = sum(result["success"] for result in results)
+        statistics = {
+            "evaluated_expectations": evaluated,
+            "successful_expectations": successful,
+            "unsuccessful_expectations": evaluated - successful,
+            "success_percent": successful / evaluated * 100 if evaluated else 0.0
+        }
+        
+        return {
+            "success": successful == evaluated,
+            "statistics": statistics,
+            "results": results,
+            "evaluated_expectations": evaluated,
+            "successful_expectations": successful,
+            "unsuccessful_expectations": evaluated - successful,
+            "success_percent": statistics["success_percent"]
+        }
 
 
 def create_simple_expectations_suite() -> List[Dict[str, str]]:
@@ -339,7 +827,7 @@ def create_simple_expectations_suite() -> List[Dict[str, str]]:
         },
         {
             "category": "Consistency",
-            "expectation": "Date Of Sale is valid date",
+            "expectation": "Date Of Sale is valid date for 99% of records",
             "rationale": "Invalid dates break time-series analysis"
         },
         {
@@ -347,6 +835,11 @@ def create_simple_expectations_suite() -> List[Dict[str, str]]:
             "expectation": "Store Name from known list",
             "rationale": "Unknown stores may indicate data quality issues"
         },
+        {
+            "category": "Consistency",
+            "expectation": "Total Sales within 0.5-2x Quantity x RRP for 99% of records",
+            "rationale": "Sales far from list value point to unit or entry errors"
+        },
         {
             "category": "Uniqueness",
             "expectation": "No exact duplicate rows",
@@ -365,85 +858,84 @@ def create_simple_expectations_suite() -> List[Dict[str, str]]:
 
 # if __name__ == "__main__":
 #     """Test the expectations suite"""
-    
+
 #     print("=" * 80)
 #     print("GREAT EXPECTATIONS TEST SUITE")
 #     print("=" * 80)
 #     print()
-    
+
 #     # Display simple expectations
 #     print("DATA QUALITY EXPECTATIONS")
 #     print("-" * 80)
 #     expectations = create_simple_expectations_suite()
-    
+
 #     current_category = None
 #     for exp in expectations:
 #         if exp["category"] != current_category:
 #             current_category = exp["category"]
 #             print(f"\n {current_category.upper()}")
 #             print("-" * 80)
-        
+
 #         print(f" {exp['expectation']}")
 #         print(f"  Rationale: {exp['rationale']}")
-    
+
 #     print()
 #     print("=" * 80)
 #     print("VALIDATION TEST")
 #     print("=" * 80)
 #     print()
-    
+
 #     # Load test data
 #     data_path = Path(__file__).parent.parent.parent / "data" / "raw" / "Test_Data.xlsx"
 #     print(f"Loading data from {data_path}...")
 #     df = pl.read_excel(data_path)
 #     print(f" Loaded {len(df):,} records")
 #     print()
-    
+
 #     # Note: Great Expectations full validation requires more setup
 #     # For now, we'll show the expectations framework
 #     print("Great Expectations Suite Created:")
 #     print(f"  Total Expectations: {len(expectations)}")
 #     print(f"  Categories: Schema, Completeness, Validity, Consistency, Uniqueness, Range")
 #     print()
-    
+
 #     print("These expectations define the 'contract' for good data.")
 #     print("Any violations are automatically flagged for investigation.")
 #     print()
-    
+
 #     # Show what violations would look like
 #     print("=" * 80)
 #     print("EXAMPLE VIOLATIONS (if they existed)")
 #     print("=" * 80)
 #     print()
-    
+
 #     # Check actual data against some simple expectations
 #     violations = []
-    
+
 #     # Check for nulls in critical columns
 #     for col in ANALYSIS_CONFIG.required_columns:
 #         null_count = df[col].null_count()
 #         if null_count > 0:
 #             violations.append(f" {col}: {null_count} null values")
-    
+
 #     # Check for negatives
 #     negative_qty = len(df.filter(pl.col("Quantity") < 0))
 #     if negative_qty > 0:
 #         violations.append(f" Quantity: {negative_qty} negative values (likely returns)")
-    
+
 #     negative_sales = len(df.filter(pl.col("Total Sales") < 0))
 #     if negative_sales > 0:
 #         violations.append(f"  Total Sales: {negative_sales} negative values (likely refunds)")
-    
+
 #     # Check for zeros
 #     zero_qty = len(df.filter(pl.col("Quantity") == 0))
 #     if zero_qty > 0:
 #         violations.append(f" Quantity: {zero_qty} zero values (data errors)")
-    
+
 #     if violations:
 #         print("Found data quality issues:")
 #         for violation in violations:
 #             print(f"  {violation}")
 #     else:
 #         print("No major violations found! Data quality is excellent.")
-    
-    
\ No newline at end of file
+
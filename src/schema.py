@@ -82,9 +82,9 @@ class EnrichedTransactionRecord(BaseModel):
         description="Whether this is a Bidco product"
     )
     
-    competitive_set_key: Optional[str] = Field(
+    competitive_set_key: Optional[int] = Field(
         None,
-        description="Key for grouping competitive products"
+        description="Hashed key for grouping competitive products"
     )
     
     @computed_field
@@ -286,11 +286,15 @@ class PromoPerformanceSummary(BaseModel):
 
 
 class PricePosition(str, Enum):
-    """Price positioning relative to competitors"""
+    """
+    Price positioning relative to competitors.
+    
+    Only indexed SKUs get a position; SKUs without enough competitors
+    are counted in `PriceIndexSummary.insufficient_data_skus`.
+    """
     PREMIUM = "premium"
     AT_MARKET = "at_market"
     DISCOUNT = "discount"
-    INSUFFICIENT_DATA = "insufficient_data"
 
 
 class PriceIndexResult(BaseModel):
@@ -341,6 +345,10 @@ class PriceIndexSummary(BaseModel):
     premium_skus: int
     at_market_skus: int
     discount_skus: int
+    insufficient_data_skus: int = Field(
+        0,
+        description="Target SKUs without enough competitors for an index"
+    )
     
     # Averages
     avg_price_index: float
@@ -419,12 +427,12 @@ def validate_transaction_record(record: Dict[str, Any]) -> tuple[bool, List[str]
 
 # if __name__ == "__main__":
 #     """Test schemas with sample data"""
-    
+
 #     print("=" * 80)
 #     print("SCHEMA VALIDATION TESTS (UPDATED FOR CROSS-SECTIONAL)")
 #     print("=" * 80)
 #     print()
-    
+
 #     # Test raw transaction
 #     raw_data = {
 #         "Store Name": "KIAMBU RD",
@@ -441,7 +449,7 @@ def validate_transaction_record(record: Dict[str, Any]) -> tuple[bool, List[str]
 #         "Supplier": "SUPERSLEEK LIMITED",
 #         "Date Of Sale": date(2025, 9, 23)
 #     }
-    
+
 #     try:
 #         record = RawTransactionRecord(**raw_data)
 #         print(" RawTransactionRecord validation passed")
@@ -450,9 +458,9 @@ def validate_transaction_record(record: Dict[str, Any]) -> tuple[bool, List[str]
 #         print(f"   Sales: {record.total_sales}")
 #     except Exception as e:
 #         print(f" RawTransactionRecord validation failed: {e}")
-    
+
 #     print()
-    
+
 #     # Test quality score
 #     quality_score = DataQualityScore(
 #         entity_name="KIAMBU RD",
@@ -464,12 +472,12 @@ def validate_transaction_record(record: Dict[str, Any]) -> tuple[bool, List[str]
 #         total_records=1134,
 #         is_trusted=True
 #     )
-    
+
 #     print(f" DataQualityScore created: {quality_score.entity_name}")
 #     print(f"   Grade: {quality_score.grade}")
 #     print(f"   Trusted: {quality_score.is_trusted}")
 #     print()
-    
+
 #     # Test promo result (CROSS-SECTIONAL)
 #     promo = PromoDetectionResult(
 #         item_code=280236,
@@ -491,14 +499,14 @@ def validate_transaction_record(record: Dict[str, Any]) -> tuple[bool, List[str]
 #         median_rrp=525.0,
 #         promo_coverage_pct=50.0
 #     )
-    
+
 #     print(f" PromoDetectionResult (CROSS-SECTIONAL) created: {promo.description}")
 #     print(f"   Status: {promo.promo_status.value}")
 #     print(f"   Uplift: {promo.promo_uplift_pct}% (promo stores vs baseline stores)")
 #     print(f"   Promo stores: {promo.promo_stores}, Baseline stores: {promo.baseline_stores}")
 #     print(f"   Coverage: {promo.promo_coverage_pct}%")
 #     print()
-    
+
 #     # Test promo summary
 #     promo_summary = PromoPerformanceSummary(
 #         supplier="BIDCO",
@@ -512,13 +520,13 @@ def validate_transaction_record(record: Dict[str, Any]) -> tuple[bool, List[str]
 #         avg_promo_coverage_pct=42.5,
 #         methodology="cross_sectional"
 #     )
-    
+
 #     print(f" PromoPerformanceSummary created: {promo_summary.supplier}")
 #     print(f"   SKUs on promo: {promo_summary.skus_on_promo}/{promo_summary.total_skus}")
 #     print(f"   Avg uplift: {promo_summary.avg_uplift_pct}%")
 #     print(f"   Methodology: {promo_summary.methodology}")
 #     print()
-    
+
 #     # Test price index
 #     price_idx = PriceIndexResult(
 #         item_code=280236,
@@ -535,12 +543,12 @@ def validate_transaction_record(record: Dict[str, Any]) -> tuple[bool, List[str]
 #         bidco_transaction_count=15,
 #         competitor_transaction_count=45
 #     )
-    
+
 #     print(f" PriceIndexResult created: {price_idx.description}")
 #     print(f"   Position: {price_idx.price_position.value}")
 #     print(f"   Index: {price_idx.price_index}")
 #     print()
-    
+
 #     print("=" * 80)
 #     print("All schema tests passed")
 #     print("=" * 80)
\ No newline at end of file
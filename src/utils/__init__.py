@@ -2,11 +2,20 @@
 Utility package for Bidco Retail Analysis
 """
 
+from .cache import LRUCache
 from .helpers import (
+    read_workbook,
+    scan_source,
     calculate_realized_price,
     calculate_discount_pct,
     flag_bidco_products,
+    add_supplier_key,
+    supplier_names,
+    resolve_supplier,
+    supplier_filter,
     create_competitive_set_key,
+    encode_categoricals,
+    downcast_floats,
     filter_valid_transactions,
     get_date_range,
     calculate_statistics,
@@ -24,10 +33,19 @@ from .helpers import (
 )
 
 __all__ = [
+    "LRUCache",
+    "read_workbook",
+    "scan_source",
     "calculate_realized_price",
     "calculate_discount_pct",
     "flag_bidco_products",
+    "add_supplier_key",
+    "supplier_names",
+    "resolve_supplier",
+    "supplier_filter",
     "create_competitive_set_key",
+    "encode_categoricals",
+    "downcast_floats",
     "filter_valid_transactions",
     "get_date_range",
     "calculate_statistics",
@@ -0,0 +1,44 @@
+"""
+Bounded Cache
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """
+    Thread-safe mapping that keeps only the most recently used entries.
+    
+    Used for per-supplier results, whose keys come from request paths.
+    """
+    
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Value for `key` (marking it as recently used), or `default`"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store `value`, evicting the least recently used entries over `maxsize`"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
@@ -3,11 +3,43 @@ Utility Functions
 """
 
 import polars as pl
-from typing import Optional, List, Tuple
+from typing import Hashable, Optional, List, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
 
+def read_workbook(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None
+) -> pl.DataFrame:
+    """
+    Read an Excel workbook with the calamine (fastexcel) engine.
+    
+    Only `columns` are materialized when given.
+    """
+    return pl.read_excel(path, engine="calamine", columns=columns)
+
+
+def scan_source(path: Union[str, Path]) -> pl.LazyFrame:
+    """
+    Lazily scan a transaction file (Parquet, CSV, Arrow IPC or Excel).
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    
+    if suffix == ".parquet":
+        return pl.scan_parquet(path)
+    if suffix == ".csv":
+        return pl.scan_csv(path)
+    if suffix in (".ipc", ".arrow", ".feather"):
+        return pl.scan_ipc(path)
+    if suffix in (".xlsx", ".xls"):
+        # Excel has no lazy reader; read once and continue lazily
+        return read_workbook(path).lazy()
+    
+    raise ValueError(f"Unsupported source format: {suffix}")
+
+
 def calculate_realized_price(df: pl.DataFrame) -> pl.DataFrame:
     """
     Calculate realized unit price from total sales and quantity.
@@ -41,26 +73,102 @@ def flag_bidco_products(df: pl.DataFrame, supplier_col: str = "Supplier") -> pl.
     Add a boolean column indicating if product is from Bidco.
     """
     return df.with_columns([
-        pl.col(supplier_col).str.to_lowercase().str.contains("bidco").alias("is_bidco")
+        pl.col(supplier_col).str.to_lowercase().str.contains("bidco", literal=True).alias("is_bidco")
     ])
 
 
+def add_supplier_key(df: pl.DataFrame, supplier_col: str = "Supplier") -> pl.DataFrame:
+    """
+    Add a lowercase copy of the supplier column for case-insensitive filters.
+    """
+    return df.with_columns([
+        pl.col(supplier_col).str.to_lowercase().alias("_supplier_lc")
+    ])
+
+
+def supplier_names(df: pl.DataFrame, supplier_col: str = "Supplier") -> Tuple[Tuple[str, str], ...]:
+    """
+    Distinct supplier names of a materialized frame as (lowercase, name) pairs.
+    """
+    names = df.get_column(supplier_col).unique().drop_nulls().cast(pl.String)
+    return tuple((name.lower(), name) for name in names.sort().to_list())
+
+
+def resolve_supplier(
+    supplier: str,
+    names: Optional[Tuple[Tuple[str, str], ...]] = None
+) -> Tuple[Hashable, pl.Expr]:
+    """
+    Cache key and row predicate for a case-insensitive supplier match.
+    
+    With the distinct names from `supplier_names` the match is resolved
+    up front: the key is the set of matching names (so spellings that
+    select the same suppliers share it) and rows are filtered by
+    category equality. Without them the key is the lowercase needle and
+    the predicate scans `_supplier_lc`.
+    """
+    needle = supplier.lower()
+    if names is None:
+        return needle, pl.col("_supplier_lc").str.contains(needle, literal=True)
+    
+    matches = frozenset(name for lower, name in names if needle in lower)
+    return matches, pl.col("Supplier").is_in(sorted(matches))
+
+
+def supplier_filter(supplier: str, df: Optional[pl.DataFrame] = None) -> pl.Expr:
+    """
+    Case-insensitive substring predicate on the supplier.
+    
+    With a materialized frame the match is resolved once against the
+    distinct (categorical) supplier names, so rows are filtered by
+    category equality rather than a per-row string scan.
+    """
+    names = supplier_names(df) if df is not None else None
+    return resolve_supplier(supplier, names)[1]
+
+
 def create_competitive_set_key(
     df: pl.DataFrame,
     grouping_cols: List[str] = ["Sub-Department", "Section"]
 ) -> pl.DataFrame:
     """
     Create a composite key for competitive set grouping.
+    
+    The key is a UInt64 hash of the grouping columns so group-bys and
+    joins on it hash a fixed-width integer instead of a string. Rows with
+    a null grouping column get a null key, as with string concatenation.
     """
-    # Concatenate the grouping columns with a separator
-    key_expr = pl.concat_str(
-        [pl.col(col) for col in grouping_cols],
-        separator="|"
-    ).alias("competitive_set_key")
+    all_present = pl.all_horizontal([pl.col(col).is_not_null() for col in grouping_cols])
+    key_expr = (
+        pl.when(all_present)
+        .then(pl.struct(grouping_cols).hash(seed=0))
+        .otherwise(None)
+        .alias("competitive_set_key")
+    )
     
     return df.with_columns([key_expr])
 
 
+def downcast_floats(df: pl.DataFrame, columns: List[str]) -> pl.DataFrame:
+    """
+    Cast numeric measure columns to Float32.
+    """
+    present = set(df.collect_schema().names())
+    return df.with_columns([
+        pl.col(col).cast(pl.Float32) for col in columns if col in present
+    ])
+
+
+def encode_categoricals(df: pl.DataFrame, columns: List[str]) -> pl.DataFrame:
+    """
+    Cast low-cardinality string columns to Categorical.
+    """
+    present = set(df.collect_schema().names())
+    return df.with_columns([
+        pl.col(col).cast(pl.Categorical) for col in columns if col in present
+    ])
+
+
 def filter_valid_transactions(
     df: pl.DataFrame,
     allow_negatives: bool = False,